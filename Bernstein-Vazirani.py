@@ -1,7 +1,9 @@
 from qiskit import QuantumCircuit
-from qiskit.quantum_info import Statevector
 from qiskit.visualization import plot_histogram
-import matplotlib.pyplot as plt
+import argparse
+
+from oracle_analysis import sample_counts
+from plotting import add_arguments as add_plot_arguments, configure_from_args, render, wait
 
 
 def bernstein_vazirani(s: str) -> QuantumCircuit:
@@ -32,19 +34,29 @@ def bernstein_vazirani(s: str) -> QuantumCircuit:
     return qc
 
 
-# Run the circuit
-secret = '1011'
-bv_circuit = bernstein_vazirani(secret)
+def main():
+    parser = argparse.ArgumentParser(description="Bernstein–Vazirani algorithm")
+    parser.add_argument('--secret', default='1011', help="hidden binary string s")
+    add_plot_arguments(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+
+    # Run the circuit
+    secret = args.secret
+    bv_circuit = bernstein_vazirani(secret)
+
+    print("🔎 Bernstein-Vazirani Circuit:")
+    print(bv_circuit.draw())
+
+    # Simulate: linear phase oracles are resolved structurally in O(n),
+    # other Clifford circuits are sampled on the stabilizer tableau and
+    # anything else runs on the sparse statevector backend (sparse_sim)
+    counts = sample_counts(bv_circuit, 1024)
 
-print("🔎 Bernstein-Vazirani Circuit:")
-print(bv_circuit.draw())
+    # Plot measurement outcome
+    render(plot_histogram, counts, title="Bernstein-Vazirani Output Distribution")
+    wait()
 
-# Simulate using Statevector
-sv = Statevector.from_label('0' * (len(secret)) + '1')
-final_state = sv.evolve(bv_circuit.remove_final_measurements(inplace=False))
 
-# Plot measurement outcome
-counts = final_state.sample_counts(1024)
-plot_histogram(counts)
-plt.title("Bernstein-Vazirani Output Distribution")
-plt.show()
+if __name__ == "__main__":
+    main()
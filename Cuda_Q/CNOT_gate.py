@@ -15,5 +15,10 @@ def kernel():
     mz(qvector[1])
 
 
-result = cudaq.sample(kernel)
-print(result)
\ No newline at end of file
+def main():
+    result = cudaq.sample(kernel)
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
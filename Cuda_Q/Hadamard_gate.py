@@ -13,8 +13,13 @@ def kernel():
     cudaq.measure(qubit)
 
 
-result = cudaq.sample(kernel)
-print("Measured |0> with probability " +
-      str(result["0"] / sum(result.values())))
-print("Measured |1> with probability " +
-      str(result["1"] / sum(result.values())))
\ No newline at end of file
+def main():
+    result = cudaq.sample(kernel)
+    print("Measured |0> with probability " +
+          str(result["0"] / sum(result.values())))
+    print("Measured |1> with probability " +
+          str(result["1"] / sum(result.values())))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
+import argparse
+import os
+import sys
 import cudaq
+from qiskit import QuantumCircuit
 
-backend = 'tensornet-mps'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sparse_sim
 
-servers = '2'
 
 @cudaq.kernel
 def kernel(controls_count: int):
@@ -16,28 +20,64 @@ def kernel(controls_count: int):
     mz(controls)
     mz(targets)
 
-# Set the target to execute on and query the number of QPUs in the system;
-# The number of QPUs is equal to the number of (auto-)launched server instances.
-cudaq.set_target("remote-mqpu",
-                 backend=backend,
-                 auto_launch=str(servers) if servers.isdigit() else "",
-                 url="" if servers.isdigit() else servers)
-qpu_count = cudaq.get_target().num_qpus()
-print("Number of virtual QPUs:", qpu_count)
-
-# We will launch asynchronous sampling tasks,
-# and will store the results as a future we can query at some later point.
-# Each QPU (indexed by an unique Id) is associated with a remote REST server.
-count_futures = []
-for i in range(qpu_count):
-
-    result = cudaq.sample_async(kernel, i + 1, qpu_id=i)
-    count_futures.append(result)
-print("Sampling jobs launched for asynchronous processing.")
-
-# Go do other work, asynchronous execution of sample tasks on-going.
-# Get the results, note future::get() will kick off a wait
-# if the results are not yet available.
-for idx in range(len(count_futures)):
-    counts = count_futures[idx].get()
-    print(counts)
\ No newline at end of file
+
+def kernel_circuit(controls_count: int, targets_count: int = 40):
+    """Qiskit copy of kernel() for the CPU sparse backend: only 2^controls_count amplitudes are ever nonzero"""
+    qc = QuantumCircuit(controls_count + targets_count)
+    qc.h(range(controls_count))
+    for target in range(targets_count):
+        qc.mcx(list(range(controls_count)), controls_count + target)
+    qc.measure_all()
+    return qc
+
+
+def sparse_demo(qpu_count):
+    # Same jobs as the remote QPUs, run locally on the sparse statevector backend
+    for i in range(qpu_count):
+        print(sparse_sim.sample_counts(kernel_circuit(i + 1), shots=1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asynchronous sampling on auto-launched remote QPUs")
+    parser.add_argument('--backend', default='tensornet-mps')
+    parser.add_argument('--servers', default='2', help="number of servers to auto-launch, or a server URL")
+    parser.add_argument('--sparse', action='store_true',
+                        help="run the same jobs on the local CPU sparse backend instead of remote QPUs")
+    args = parser.parse_args()
+
+    if args.sparse:
+        sparse_demo(int(args.servers) if args.servers.isdigit() else 2)
+        return
+
+    backend = args.backend
+    servers = args.servers
+
+    # Set the target to execute on and query the number of QPUs in the system;
+    # The number of QPUs is equal to the number of (auto-)launched server instances.
+    cudaq.set_target("remote-mqpu",
+                     backend=backend,
+                     auto_launch=str(servers) if servers.isdigit() else "",
+                     url="" if servers.isdigit() else servers)
+    qpu_count = cudaq.get_target().num_qpus()
+    print("Number of virtual QPUs:", qpu_count)
+
+    # We will launch asynchronous sampling tasks,
+    # and will store the results as a future we can query at some later point.
+    # Each QPU (indexed by an unique Id) is associated with a remote REST server.
+    count_futures = []
+    for i in range(qpu_count):
+
+        result = cudaq.sample_async(kernel, i + 1, qpu_id=i)
+        count_futures.append(result)
+    print("Sampling jobs launched for asynchronous processing.")
+
+    # Go do other work, asynchronous execution of sample tasks on-going.
+    # Get the results, note future::get() will kick off a wait
+    # if the results are not yet available.
+    for idx in range(len(count_futures)):
+        counts = count_futures[idx].get()
+        print(counts)
+
+
+if __name__ == "__main__":
+    main()
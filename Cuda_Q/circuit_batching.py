@@ -1,24 +1,17 @@
+import argparse
+import os
+import sys
+import time
 import cudaq
 from cudaq import spin
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
-if cudaq.num_available_gpus() == 0:
-    print("This example requires a GPU to run. No GPU detected.")
-    exit(0)
-
-np.random.seed(1)
-cudaq.set_target("nvidia")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batch_scheduler import schedule
+import batched_sim
 
 qubit_count = 5
-sample_count = 10000
-h = spin.z(0)
-parameter_count = qubit_count
-
-# prepare 10000 different input parameter sets.
-parameters = np.random.default_rng(13).uniform(low=0,
-                                               high=1,
-                                               size=(sample_count,
-                                                     parameter_count))
 
 
 @cudaq.kernel
@@ -30,37 +23,72 @@ def kernel(params: list[float]):
         rx(params[i], qubits[i])
 
 
-import time
+def observe_rows(h, rows, qpu_id):
+    """Queue one observe_async per parameter set on qpu_id and wait for the chunk"""
+    futures = [cudaq.observe_async(kernel, h, row, qpu_id=qpu_id) for row in rows]
+    return [f.get().expectation() for f in futures]
+
+
+def observe_scheduled(h, parameters, qpu_count, max_in_flight=2, **kwargs):
+    """
+    ⟨h⟩ for every parameter set, scheduled over qpu_count QPUs with work stealing
+    and adaptive chunk sizes (see batch_scheduler.schedule).
+    """
+    with ThreadPoolExecutor(max_workers=qpu_count * max_in_flight) as pool:
+        def submit(qpu_id, start, stop):
+            return pool.submit(observe_rows, h, parameters[start:stop], qpu_id)
+        return schedule(submit, parameters.shape[0], qpu_count, max_in_flight=max_in_flight, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched observe over many parameter sets on one or many GPUs")
+    parser.add_argument('--sample-count', type=int, default=10000)
+    parser.add_argument('--target', choices=['nvidia', 'qpp-cpu'], default='nvidia')
+    parser.add_argument('--max-in-flight', type=int, default=2, help="outstanding chunks per QPU")
+    args = parser.parse_args()
+
+    if args.target == "nvidia" and cudaq.num_available_gpus() == 0:
+        print("This example requires a GPU to run. No GPU detected. Try --target qpp-cpu.")
+        return
+
+    np.random.seed(1)
+    cudaq.set_target(args.target)
 
-start_time = time.time()
-cudaq.observe(kernel, h, parameters)
-end_time = time.time()
-print(end_time - start_time)
+    sample_count = args.sample_count
+    h = spin.z(0)
+    parameter_count = qubit_count
 
+    # prepare 10000 different input parameter sets.
+    parameters = np.random.default_rng(13).uniform(low=0,
+                                                   high=1,
+                                                   size=(sample_count,
+                                                         parameter_count))
 
-print('There are', parameters.shape[0], 'parameter sets to execute')
+    start_time = time.time()
+    cudaq.observe(kernel, h, parameters)
+    end_time = time.time()
+    print(end_time - start_time)
 
-xi = np.split(
-    parameters,
-    4)  # Split the parameters into 4 arrays since 4 GPUs are available.
+    print('There are', parameters.shape[0], 'parameter sets to execute')
 
-print('Split parameters into', len(xi), 'batches of', xi[0].shape[0], ',',
-      xi[1].shape[0], ',', xi[2].shape[0], ',', xi[3].shape[0])
+    # Same sweep on the CPU with all parameter sets in one (batch, 2^n) tensor
+    start_time = time.time()
+    batched = batched_sim.observe(batched_sim.rx_kernel_circuit(qubit_count), 'I' * (qubit_count - 1) + 'Z', parameters)
+    end_time = time.time()
+    print('Batched NumPy engine', end_time - start_time)
 
+    # Hand out the parameter sets dynamically to however many QPUs the target has.
+    # With the mqpu option every available GPU is one QPU; qpp-cpu runs on a single one.
+    if args.target == "nvidia":
+        cudaq.set_target("nvidia", option="mqpu")
+    qpu_count = cudaq.get_target().num_qpus()
 
-# Timing the execution on a single GPU vs 4 GPUs,
-# one will see a nearly 4x performance improvement if 4 GPUs are available.
+    start_time = time.time()
+    result, stats = observe_scheduled(h, parameters, qpu_count, args.max_in_flight)
+    end_time = time.time()
+    print(end_time - start_time)
+    print('Chunks per QPU', stats['chunks'], 'rows per QPU', stats['rows'])
 
-cudaq.set_target("nvidia", option="mqpu")
-asyncresults = []
-num_gpus = cudaq.num_available_gpus()
 
-start_time = time.time()
-for i in range(len(xi)):
-    for j in range(xi[i].shape[0]):
-        qpu_id = i * num_gpus // len(xi)
-        asyncresults.append(
-            cudaq.observe_async(kernel, h, xi[i][j, :], qpu_id=qpu_id))
-result = [res.get() for res in asyncresults]
-end_time = time.time()
-print(end_time - start_time)      
\ No newline at end of file
+if __name__ == "__main__":
+    main()
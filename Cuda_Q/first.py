@@ -1,3 +1,5 @@
+import argparse
+import timeit
 import cudaq
 
 
@@ -16,26 +18,6 @@ def kernel(qubit_count: int):
     mz(qvector)
 
 
-qubit_count = 2
-print(cudaq.draw(kernel, qubit_count))
-results = cudaq.sample(kernel, qubit_count)
-# Should see a roughly 50/50 distribution between the |00> and
-# |11> states. Example: {00: 505  11: 495}
-print("Measurement distribution:" + str(results))    
-
-results = cudaq.sample(kernel, qubit_count, shots_count=10000)
-print("Measurement distribution:" + str(results))
-
-
-most_probable_result = results.most_probable()
-probability = results.probability(most_probable_result)
-print("Most probable result: " + most_probable_result)
-print("Measured with probability " + str(probability), end='\n\n')
-
-
-
-
-
 @cudaq.kernel
 def kernel2(qubit_count: int):
     # Allocate our qubits.
@@ -46,50 +28,78 @@ def kernel2(qubit_count: int):
     mz(qvector)
 
 
-num_gpus = cudaq.num_available_gpus()
-if num_gpus > 1:
-    # Set the target to include multiple virtual QPUs.
-    cudaq.set_target("nvidia", option="mqpu")
-    # Asynchronous execution on multiple virtual QPUs, each simulated by an NVIDIA GPU.
-    result_1 = cudaq.sample_async(kernel,
-                                  qubit_count,
-                                  shots_count=1000,
-                                  qpu_id=0)
-    result_2 = cudaq.sample_async(kernel2,
-                                  qubit_count,
-                                  shots_count=1000,
-                                  qpu_id=1)
-else:
-    # Schedule for execution on the same virtual QPU.
-    result_1 = cudaq.sample_async(kernel,
-                                  qubit_count,
-                                  shots_count=1000,
-                                  qpu_id=0)
-    result_2 = cudaq.sample_async(kernel2,
-                                  qubit_count,
-                                  shots_count=1000,
-                                  qpu_id=0)
-
-print("Measurement distribution for kernel:" + str(result_1.get()))
-print("Measurement distribution for kernel2:" + str(result_2.get()))
-
-
-
-import sys
-import cudaq
-import timeit
-
-# Will time the execution of our sample call.
-code_to_time = 'cudaq.sample(kernel, qubit_count, shots_count=1000000)'
-qubit_count = int(sys.argv[1]) if 1 < len(sys.argv) else 25
-
-# Execute on CPU backend.
-cudaq.set_target('qpp-cpu')
-print('CPU time')  # Example: 27.57462 s.
-print(timeit.timeit(stmt=code_to_time, globals=globals(), number=1))
-
-if cudaq.num_available_gpus() > 0:
-    # Execute on GPU backend.
-    cudaq.set_target('nvidia')
-    print('GPU time')  # Example: 0.773286 s.
-    print(timeit.timeit(stmt=code_to_time, globals=globals(), number=1))
\ No newline at end of file
+def sample_demo(qubit_count):
+    print(cudaq.draw(kernel, qubit_count))
+    results = cudaq.sample(kernel, qubit_count)
+    # Should see a roughly 50/50 distribution between the |00> and
+    # |11> states. Example: {00: 505  11: 495}
+    print("Measurement distribution:" + str(results))
+
+    results = cudaq.sample(kernel, qubit_count, shots_count=10000)
+    print("Measurement distribution:" + str(results))
+
+    most_probable_result = results.most_probable()
+    probability = results.probability(most_probable_result)
+    print("Most probable result: " + most_probable_result)
+    print("Measured with probability " + str(probability), end='\n\n')
+
+
+def async_demo(qubit_count):
+    num_gpus = cudaq.num_available_gpus()
+    if num_gpus > 1:
+        # Set the target to include multiple virtual QPUs.
+        cudaq.set_target("nvidia", option="mqpu")
+        # Asynchronous execution on multiple virtual QPUs, each simulated by an NVIDIA GPU.
+        result_1 = cudaq.sample_async(kernel,
+                                      qubit_count,
+                                      shots_count=1000,
+                                      qpu_id=0)
+        result_2 = cudaq.sample_async(kernel2,
+                                      qubit_count,
+                                      shots_count=1000,
+                                      qpu_id=1)
+    else:
+        # Schedule for execution on the same virtual QPU.
+        result_1 = cudaq.sample_async(kernel,
+                                      qubit_count,
+                                      shots_count=1000,
+                                      qpu_id=0)
+        result_2 = cudaq.sample_async(kernel2,
+                                      qubit_count,
+                                      shots_count=1000,
+                                      qpu_id=0)
+
+    print("Measurement distribution for kernel:" + str(result_1.get()))
+    print("Measurement distribution for kernel2:" + str(result_2.get()))
+
+
+def time_cpu_gpu(qubit_count):
+    # Will time the execution of our sample call.
+    def code_to_time():
+        cudaq.sample(kernel, qubit_count, shots_count=1000000)
+
+    # Execute on CPU backend.
+    cudaq.set_target('qpp-cpu')
+    print('CPU time')  # Example: 27.57462 s.
+    print(timeit.timeit(stmt=code_to_time, number=1))
+
+    if cudaq.num_available_gpus() > 0:
+        # Execute on GPU backend.
+        cudaq.set_target('nvidia')
+        print('GPU time')  # Example: 0.773286 s.
+        print(timeit.timeit(stmt=code_to_time, number=1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="First CUDA-Q kernels: sampling, async execution and timing")
+    parser.add_argument('--qubit-count', type=int, default=2)
+    parser.add_argument('--timing-qubits', type=int, default=25)
+    args = parser.parse_args()
+
+    sample_demo(args.qubit_count)
+    async_demo(args.qubit_count)
+    time_cpu_gpu(args.timing_qubits)
+
+
+if __name__ == "__main__":
+    main()
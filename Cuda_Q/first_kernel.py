@@ -26,11 +26,16 @@ def kernel():
     mz(qubit)
 
 
-# Finally, we can execute this kernel on the state vector simulator
-# by calling `cudaq.sample`. This will execute the provided kernel
-# `shots_count` number of times and return the sampled distribution
-# as a `cudaq.SampleResult` dictionary.
-result = cudaq.sample(kernel)
-
-# Now let's take a look at the `SampleResult` we've gotten back!
-print(result)
\ No newline at end of file
+def main():
+    # Finally, we can execute this kernel on the state vector simulator
+    # by calling `cudaq.sample`. This will execute the provided kernel
+    # `shots_count` number of times and return the sampled distribution
+    # as a `cudaq.SampleResult` dictionary.
+    result = cudaq.sample(kernel)
+
+    # Now let's take a look at the `SampleResult` we've gotten back!
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,14 @@
+import argparse
+import os
+import sys
+import time
 import cudaq
 from cudaq import spin
+import numpy as np
 
-if cudaq.num_available_gpus() == 0:
-    print("This example requires a GPU to run. No GPU detected.")
-    exit(0)
-
-cudaq.set_target("nvidia", option="mqpu")
-cudaq.mpi.initialize()
-
-qubit_count = 15
-term_count = 100000
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import measurement_plan
+import pauli_sum
 
 
 @cudaq.kernel
@@ -22,29 +21,86 @@ def kernel(n_qubits: int):
         x.ctrl(qubits[0], qubits[i])
 
 
-# Create a random Hamiltonian
-hamiltonian = cudaq.SpinOperator.random(qubit_count, term_count)
+# Same observe on the CPU: GHZ amplitudes and a packed-bitmask random Hamiltonian
+def cpu_expectation(qubit_count, term_count, seed=None, shots=0, grouping='qubitwise', precision=None):
+    psi = np.zeros(1 << qubit_count, dtype=np.complex128)
+    psi[0] = psi[-1] = 1 / np.sqrt(2)
+    hamiltonian = pauli_sum.random_pauli_sum(qubit_count, term_count, seed)
+
+    start = time.perf_counter()
+    value = pauli_sum.expectation(hamiltonian, psi)
+    print(f"⏱️  <H> = {value:.6f} over {hamiltonian['x'].size} terms in {time.perf_counter() - start:.4f} s")
+    if shots:
+        # Shot-based estimate: one measurement circuit per commuting group instead of per term
+        start = time.perf_counter()
+        plan = measurement_plan.plan(hamiltonian, grouping)
+        planned = time.perf_counter() - start
+        results = measurement_plan.sample_groups(psi, plan, shots, seed)
+        estimate = measurement_plan.estimate(hamiltonian, plan, results)
+        print(f"🎯 {shots} shots x {len(plan['groups'])} {grouping} groups: <H> ≈ {estimate:.6f} "
+              f"(planned in {planned:.2f} s, total {time.perf_counter() - start:.2f} s)")
+    if precision:
+        # Adaptive shots: pilot rounds, then shots ∝ σ per group until the error bar is below precision
+        start = time.perf_counter()
+        estimate, error, used = measurement_plan.observe_to_precision(psi, hamiltonian, precision, grouping, seed=seed)
+        print(f"🎯 <H> ≈ {estimate:.6f} ± {error:.6f} with {used} adaptive shots "
+              f"in {time.perf_counter() - start:.2f} s")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Observe a random Hamiltonian on one or many GPUs")
+    parser.add_argument('--qubit-count', type=int, default=15)
+    parser.add_argument('--term-count', type=int, default=100000)
+    parser.add_argument('--target', choices=['nvidia', 'numpy'], default='nvidia')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--shots', type=int, default=0, help="numpy target: also estimate <H> from shots per measurement group")
+    parser.add_argument('--grouping', choices=['qubitwise', 'full'], default='qubitwise')
+    parser.add_argument('--precision', type=float, default=None,
+                        help="numpy target: adaptive shots until the standard error is below this value")
+    args = parser.parse_args()
+
+    if args.target == 'numpy':
+        cpu_expectation(args.qubit_count, args.term_count, args.seed, args.shots, args.grouping, args.precision)
+        return
+
+    if cudaq.num_available_gpus() == 0:
+        print("This example requires a GPU to run. No GPU detected.")
+        return
+
+    cudaq.set_target("nvidia", option="mqpu")
+    cudaq.mpi.initialize()
+
+    qubit_count = args.qubit_count
+    term_count = args.term_count
+
+    # Create a random Hamiltonian
+    hamiltonian = cudaq.SpinOperator.random(qubit_count, term_count)
+
+    # The observe calls allows calculation of the the expectation value of the Hamiltonian with respect to a specified kernel.
+
+    # Single node, single GPU.
+    result = cudaq.observe(kernel, hamiltonian, qubit_count)
+    result.expectation()
 
-# The observe calls allows calculation of the the expectation value of the Hamiltonian with respect to a specified kernel.
+    # If multiple GPUs/ QPUs are available, the computation can parallelize with the addition of an argument in the observe call.
 
-# Single node, single GPU.
-result = cudaq.observe(kernel, hamiltonian, qubit_count)
-result.expectation()
+    # Single node, multi-GPU.
+    result = cudaq.observe(kernel,
+                           hamiltonian,
+                           qubit_count,
+                           execution=cudaq.parallel.thread)
+    result.expectation()
 
-# If multiple GPUs/ QPUs are available, the computation can parallelize with the addition of an argument in the observe call.
+    # Multi-node, multi-GPU.
+    result = cudaq.observe(kernel,
+                           hamiltonian,
+                           qubit_count,
+                           execution=cudaq.parallel.mpi)
+    result.expectation()
 
-# Single node, multi-GPU.
-result = cudaq.observe(kernel,
-                       hamiltonian,
-                       qubit_count,
-                       execution=cudaq.parallel.thread)
-result.expectation()
+    cudaq.mpi.finalize()
 
-# Multi-node, multi-GPU.
-result = cudaq.observe(kernel,
-                       hamiltonian,
-                       qubit_count,
-                       execution=cudaq.parallel.mpi)
-result.expectation()
 
-cudaq.mpi.finalize()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
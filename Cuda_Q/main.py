@@ -1,3 +1,6 @@
+import argparse
+import os
+import sys
 import cudaq
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
@@ -10,6 +13,9 @@ import GPUtil
 from collections import Counter
 import threading
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from plotting import add_arguments as add_plot_arguments, configure_from_args, mode as plot_mode, save
+
 sns.set_context("notebook")
 sns.set_style("darkgrid")
 
@@ -27,23 +33,28 @@ def ghz(qubit_count: int):
         cx(q[0], q[i])
     mz(q)
 
-fig, axs = plt.subplots(2, 2, figsize=(14, 10))
-fig.suptitle("🚀 Real-Time CUDA-Q Quantum Benchmarking Dashboard", fontsize=16, weight='bold')
+fig = axs = histogram_ax = None
+cpu_line = gpu_line = mem_line = None
+
+def build_dashboard():
+    global fig, axs, histogram_ax, cpu_line, gpu_line, mem_line
+    fig, axs = plt.subplots(2, 2, figsize=(14, 10))
+    fig.suptitle("🚀 Real-Time CUDA-Q Quantum Benchmarking Dashboard", fontsize=16, weight='bold')
 
-cpu_line, = axs[0, 0].plot([], [], label='CPU %', color='tab:blue')
-gpu_line, = axs[0, 1].plot([], [], label='GPU Load %', color='tab:green')
-mem_line, = axs[1, 0].plot([], [], label='GPU Mem %', color='tab:red')
+    cpu_line, = axs[0, 0].plot([], [], label='CPU %', color='tab:blue')
+    gpu_line, = axs[0, 1].plot([], [], label='GPU Load %', color='tab:green')
+    mem_line, = axs[1, 0].plot([], [], label='GPU Mem %', color='tab:red')
 
-for ax in [axs[0, 0], axs[0, 1], axs[1, 0]]:
-    ax.set_xlim(0, 30)
-    ax.set_ylim(0, 100)
-    ax.grid(True)
-    ax.legend()
+    for ax in [axs[0, 0], axs[0, 1], axs[1, 0]]:
+        ax.set_xlim(0, 30)
+        ax.set_ylim(0, 100)
+        ax.grid(True)
+        ax.legend()
 
-axs[0, 0].set_title("CPU Usage (%)")
-axs[0, 1].set_title("GPU Load (%)")
-axs[1, 0].set_title("GPU Memory Usage (%)")
-histogram_ax = axs[1, 1]
+    axs[0, 0].set_title("CPU Usage (%)")
+    axs[0, 1].set_title("GPU Load (%)")
+    axs[1, 0].set_title("GPU Memory Usage (%)")
+    histogram_ax = axs[1, 1]
 
 def update(frame):
     elapsed = time.time() - start_time
@@ -72,8 +83,6 @@ def update(frame):
 
     return cpu_line, gpu_line, mem_line
 
-ani = animation.FuncAnimation(fig, update, interval=200)
-
 def perform_heavy_gpu_sampling(qubit_count, batches=25):
     cudaq.set_target("nvidia")
     all_results = []
@@ -89,6 +98,8 @@ def perform_heavy_gpu_sampling(qubit_count, batches=25):
         counts[str(state)] += all_results.count(state)
 
     sorted_counts = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+    if histogram_ax is None:
+        return
 
     histogram_ax.clear()
     histogram_ax.bar(sorted_counts.keys(), sorted_counts.values(), color=sns.color_palette("deep"))
@@ -98,19 +109,40 @@ def perform_heavy_gpu_sampling(qubit_count, batches=25):
     histogram_ax.tick_params(axis='x', rotation=90)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Real-time CUDA-Q benchmarking dashboard")
+    parser.add_argument('--qubit-count', type=int, default=12)
+    add_plot_arguments(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+
     print("🚀 DRDO CUDA-Q Benchmarking Dashboard")
     print(f"🧠 OS: {platform.system()} | CUDA-Q: {cudaq.__version__}")
     print(f"🎯 CUDA GPUs: {cudaq.num_available_gpus()} available\n")
 
     if cudaq.num_available_gpus() == 0:
         print("❌ No CUDA GPUs found by CUDA-Q. Aborting.")
+    elif plot_mode() == 'off':
+        perform_heavy_gpu_sampling(args.qubit_count)
+        print("✅ Benchmarking Complete.")
     else:
-        ghz_thread = threading.Thread(target=perform_heavy_gpu_sampling, args=(12,))
+        build_dashboard()
+        ghz_thread = threading.Thread(target=perform_heavy_gpu_sampling, args=(args.qubit_count,))
         ghz_thread.start()
 
         plt.tight_layout()
         plt.subplots_adjust(top=0.92)
-        plt.show()
+        if plot_mode() == 'show':
+            ani = animation.FuncAnimation(fig, update, interval=200)
+            plt.show()
+        else:
+            # Headless: keep sampling the resource monitor, then write the final dashboard
+            frame = 0
+            while ghz_thread.is_alive():
+                update(frame)
+                frame += 1
+                time.sleep(0.2)
 
         ghz_thread.join()
+        if plot_mode() == 'save':
+            save(fig, "benchmark_dashboard")
         print("✅ Benchmarking Complete.")
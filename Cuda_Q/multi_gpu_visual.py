@@ -1,3 +1,6 @@
+import argparse
+import os
+import sys
 import cudaq
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -9,6 +12,10 @@ import GPUtil
 import threading
 from collections import Counter
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from plotting import add_arguments as add_plot_arguments, configure_from_args, mode as plot_mode, render, wait
+import sharded_sim
+
 # Set visual style
 sns.set_context("notebook")
 sns.set_style("darkgrid")
@@ -62,9 +69,9 @@ def monitor_resources(duration=10):
         gpu_mem_history.append(gpu_mem)
         time_history.append(time.time() - start_time)
 
-# Plot dynamic CPU and GPU resource usage
-def plot_resource_usage():
-    plt.figure(figsize=(12, 6))
+# Dynamic CPU and GPU resource usage
+def resource_usage_figure(time_history, cpu_percent_history, gpu_load_history, gpu_mem_history):
+    fig = plt.figure(figsize=(12, 6))
     plt.plot(time_history, cpu_percent_history, label="CPU Usage %", color="tab:blue")
     plt.plot(time_history, gpu_load_history, label="GPU Load %", color="tab:green")
     plt.plot(time_history, gpu_mem_history, label="GPU Memory %", color="tab:red")
@@ -74,18 +81,16 @@ def plot_resource_usage():
     plt.legend()
     plt.grid(True)
     plt.tight_layout()
-    plt.savefig("real_time_resource_usage.png", dpi=300)
-    plt.show(block=False)
-    plt.pause(0.1)
+    return fig
 
-# Plot measurement results
-def plot_result(result, title, filename=None):
-    counts = Counter()
-    for state in result:
-        counts[str(state)] += result.count(state)
-    sorted_counts = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+# Plot dynamic CPU and GPU resource usage
+def plot_resource_usage():
+    render(resource_usage_figure, time_history, cpu_percent_history, gpu_load_history, gpu_mem_history,
+           filename="real_time_resource_usage.png", block=False)
 
-    plt.figure(figsize=(14, 6))
+# Measurement results
+def result_figure(sorted_counts, title):
+    fig = plt.figure(figsize=(14, 6))
     bars = plt.bar(sorted_counts.keys(), sorted_counts.values(), color=sns.color_palette("deep"))
     plt.title(title, fontsize=16, weight='bold')
     plt.xlabel("Quantum Measurement Outcomes")
@@ -95,13 +100,22 @@ def plot_result(result, title, filename=None):
     for bar in bars:
         yval = bar.get_height()
         plt.text(bar.get_x() + bar.get_width() / 2, yval + 5, int(yval), ha='center', fontsize=8)
-    if filename:
-        plt.savefig(filename, dpi=300)
-    plt.show(block=False)
-    plt.pause(0.1)
+    return fig
+
+# Plot measurement results
+def plot_result(result, title, filename=None):
+    counts = Counter()
+    if isinstance(result, dict):
+        counts.update(result)
+    else:
+        for state in result:
+            counts[str(state)] += result.count(state)
+    sorted_counts = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+    render(result_figure, sorted_counts, title, filename=filename, name=title, block=False)
 
 # Benchmark and compare CPU vs GPU
-def benchmark(qubit_count):
+def benchmark(qubit_count, cpu_processes=()):
     benchmarks = []
 
     print("\n🔵 Sampling using CPU (qpp-cpu)...")
@@ -109,6 +123,15 @@ def benchmark(qubit_count):
     plot_result(result_cpu, f"GHZ({qubit_count}) on CPU", filename="ghz_cpu.png")
     benchmarks.append(('CPU', time_cpu))
 
+    # Sharded statevector across CPU worker processes (no GPU needed)
+    for processes in cpu_processes:
+        print(f"\n🟠 Sampling using {processes} sharded CPU processes...")
+        start = time.time()
+        result_sharded = sharded_sim.sample_ghz_state(qubit_count, processes=processes)
+        benchmarks.append((f"CPU x{processes}", time.time() - start))
+    if cpu_processes:
+        plot_result(result_sharded, f"GHZ({qubit_count}) on {processes} CPU Processes", filename="ghz_sharded_cpu.png")
+
     if cudaq.num_available_gpus() > 0:
         print("\n🟢 Sampling using GPU (nvidia)...")
         monitor_resources_thread = threading.Thread(target=monitor_resources, args=(5,))
@@ -130,10 +153,10 @@ def benchmark(qubit_count):
 
     return benchmarks
 
-# Plot benchmark comparison
-def plot_benchmarks(benchmarks):
+# Benchmark comparison
+def benchmarks_figure(benchmarks):
     labels, times = zip(*benchmarks)
-    plt.figure(figsize=(8, 5))
+    fig = plt.figure(figsize=(8, 5))
     sns.barplot(x=labels, y=times, palette="coolwarm")
     plt.title("⏱️ Execution Time Comparison", fontsize=15, weight='bold')
     plt.ylabel("Execution Time (seconds)")
@@ -141,19 +164,32 @@ def plot_benchmarks(benchmarks):
     for i, t in enumerate(times):
         plt.text(i, t + 0.01, f"{t:.3f}s", ha='center', fontsize=10)
     plt.tight_layout()
-    plt.savefig("execution_comparison.png", dpi=300)
-    plt.show(block=False)
-    plt.pause(0.1)
+    return fig
+
+# Plot benchmark comparison
+def plot_benchmarks(benchmarks):
+    render(benchmarks_figure, benchmarks, filename="execution_comparison.png", block=False)
 
 # Main execution
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GHZ benchmark on CPU, GPU and multi-GPU CUDA-Q targets")
+    parser.add_argument('--qubit-count', type=int, default=20)  # Recommended for GPU — increase if multi-GPU available
+    parser.add_argument('--cpu-processes', default='1,2,4',
+                        help="comma-separated process counts for the sharded CPU simulator ('' to skip)")
+    add_plot_arguments(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+
     print("🚀 DRDO Quantum Benchmarking Suite — CUDA-Q")
     print(f"🧬 System: {platform.system()} {platform.release()}")
     print(f"🧪 Python: {platform.python_version()} | CUDA-Q: {cudaq.__version__}\n")
 
-    qubit_count = 20  # Recommended for GPU — increase if multi-GPU available
-    benchmarks = benchmark(qubit_count)
+    qubit_count = args.qubit_count
+    cpu_processes = [int(p) for p in args.cpu_processes.split(',') if p]
+    benchmarks = benchmark(qubit_count, cpu_processes)
     plot_benchmarks(benchmarks)
     plot_resource_usage()
+    wait()
 
-    input("\n✅ All plots displayed. Press Enter to close everything and exit...")
+    if plot_mode() == 'show':
+        input("\n✅ All plots displayed. Press Enter to close everything and exit...")
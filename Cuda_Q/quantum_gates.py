@@ -13,6 +13,11 @@ def kernel():
     mz(qubit)
 
 
-# Sample the qubit for 1000 shots to gather statistics.
-result = cudaq.sample(kernel)
-print(result.most_probable())
\ No newline at end of file
+def main():
+    # Sample the qubit for 1000 shots to gather statistics.
+    result = cudaq.sample(kernel)
+    print(result.most_probable())
+
+
+if __name__ == "__main__":
+    main()
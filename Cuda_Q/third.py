@@ -1,18 +1,38 @@
-import sys
-import cudaq
+import argparse
 import timeit
+import cudaq
+
+
+@cudaq.kernel
+def kernel(qubit_count: int):
+    qvector = cudaq.qvector(qubit_count)
+    h(qvector[0])
+    for qubit in range(qubit_count - 1):
+        x.ctrl(qvector[qubit], qvector[qubit + 1])
+    mz(qvector)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time GHZ sampling on the CPU and GPU targets")
+    parser.add_argument('qubit_count', type=int, nargs='?', default=25)
+    args = parser.parse_args()
+    qubit_count = args.qubit_count
+
+    # Will time the execution of our sample call.
+    def code_to_time():
+        cudaq.sample(kernel, qubit_count, shots_count=1000000)
+
+    # Execute on CPU backend.
+    cudaq.set_target('qpp-cpu')
+    print('CPU time')  # Example: 27.57462 s.
+    print(timeit.timeit(stmt=code_to_time, number=1))
 
-# Will time the execution of our sample call.
-code_to_time = 'cudaq.sample(kernel, qubit_count, shots_count=1000000)'
-qubit_count = int(sys.argv[1]) if 1 < len(sys.argv) else 25
+    if cudaq.num_available_gpus() > 0:
+        # Execute on GPU backend.
+        cudaq.set_target('nvidia')
+        print('GPU time')  # Example: 0.773286 s.
+        print(timeit.timeit(stmt=code_to_time, number=1))
 
-# Execute on CPU backend.
-cudaq.set_target('qpp-cpu')
-print('CPU time')  # Example: 27.57462 s.
-print(timeit.timeit(stmt=code_to_time, globals=globals(), number=1))
 
-if cudaq.num_available_gpus() > 0:
-    # Execute on GPU backend.
-    cudaq.set_target('nvidia')
-    print('GPU time')  # Example: 0.773286 s.
-    print(timeit.timeit(stmt=code_to_time, globals=globals(), number=1))
\ No newline at end of file
+if __name__ == "__main__":
+    main()
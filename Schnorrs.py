@@ -1,50 +1,242 @@
 from qiskit import QuantumCircuit
-from qiskit.circuit.library import QFT
+from qiskit.circuit.library import UnitaryGate
+from math import gcd, isqrt
+import argparse
+import time
 import numpy as np
-import matplotlib.pyplot as plt
 
+from qft import apply_qft, qft_gate
+from sampling import sample_indices
+from Shors import find_period
+from statevector_sim import apply_permutation, modmul_permutation, probabilities
 
-def discrete_log_example():
-    """
-    Simulate the structure of Schnorr's algorithm using QPE approach
-    for solving a^x ≡ b (mod p) where p is a prime, and a, b are integers.
-    """
-    # Parameters (Toy values for demo)
-    p = 7
-    a = 3
-    b = 5
 
-    print(f"🔐 Solving for x in {a}^x ≡ {b} (mod {p})")
+def multiplicative_order(a, p):
+    """Order r of a modulo p (smallest r > 0 with a^r ≡ 1), by checking divisors of p − 1"""
+    n = p - 1
+    r = n
+    for q in _prime_factors(n):
+        while r % q == 0 and pow(a, r // q, p) == 1:
+            r //= q
+    return r
+
+
+def _prime_factors(n):
+    """Distinct prime factors of n by trial division"""
+    factors, d = [], 2
+    while d * d <= n:
+        if n % d == 0:
+            factors.append(d)
+            while n % d == 0:
+                n //= d
+        d += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
 
-    # Simulated: Try all x until a^x % p == b (classical brute-force)
+def discrete_log_bruteforce(a, b, p):
+    """Original O(p) search: try every x until a^x ≡ b (mod p)"""
     for x in range(1, p):
         if pow(a, x, p) == b:
-            print(f"✅ Solution found classically: x = {x}")
-            break
+            return x
+    return None
+
+
+def discrete_log_bsgs(a, b, p):
+    """Baby-step giant-step in O(√p) time and memory"""
+    m = isqrt(p - 1) + 1
+    baby = {}
+    e = 1
+    for j in range(m):
+        baby.setdefault(e, j)
+        e = e * a % p
+
+    giant = pow(a, -m, p)
+    gamma = b % p
+    for i in range(m):
+        if gamma in baby:
+            return i * m + baby[gamma]
+        gamma = gamma * giant % p
+    return None
+
+
+def discrete_log_pollard_rho(a, b, p, seed=None, max_restarts=20):
+    """
+    Pollard's rho for logarithms: O(√r) time with O(1) memory, r = order of a.
+    Walks x = a^A·b^B with Floyd cycle detection and solves the collision congruence.
+    """
+    if b % p == 1:
+        return 0
+    r = multiplicative_order(a, p)
+    rng = np.random.default_rng(seed)
+
+    def step(x, A, B):
+        if x % 3 == 0:
+            return x * x % p, 2 * A % r, 2 * B % r
+        if x % 3 == 1:
+            return x * a % p, (A + 1) % r, B
+        return x * b % p, A, (B + 1) % r
+
+    for _ in range(max_restarts):
+        A, B = (int(v) for v in rng.integers(0, r, size=2))
+        x = pow(a, A, p) * pow(b, B, p) % p
+        slow, fast = (x, A, B), step(x, A, B)
+        while slow[0] != fast[0]:
+            slow = step(*slow)
+            fast = step(*step(*fast))
+
+        # a^A1·b^B1 = a^A2·b^B2  →  x·(B2 − B1) ≡ A1 − A2 (mod r)
+        lhs, rhs = (fast[2] - slow[2]) % r, (slow[1] - fast[1]) % r
+        d = gcd(lhs, r)
+        if lhs == 0 or rhs % d:
+            continue
+        r_d = r // d
+        x0 = (rhs // d) * pow(lhs // d, -1, r_d) % r_d
+        for k in range(d):
+            if pow(a, x0 + k * r_d, p) == b % p:
+                return x0 + k * r_d
+    return None
+
+
+def _controlled_mul_gate(c, p, m, power):
+    """Controlled |y⟩ → |c^power·y mod p⟩ as a permutation unitary"""
+    perm = modmul_permutation(c, p, m, power)
+    mat = np.zeros((2**m, 2**m))
+    mat[perm, np.arange(2**m)] = 1
+    return UnitaryGate(mat, label=f"{c}^{power} mod {p}").control(1)
 
-    # Now: Build illustrative QPE-like quantum circuit
-    n_count = 3  # 3 qubits for phase estimation (mock)
-    qc = QuantumCircuit(n_count + 1, n_count)
 
-    # Step 1: Apply Hadamards to counting register
-    qc.h(range(n_count))
+def register_sizes(p):
+    """t = m + 1 qubits for each exponent register and m = p.bit_length() target qubits"""
+    m = p.bit_length()
+    return m + 1, m
+
+
+def discrete_log_circuit(a, b, p):
+    """
+    Two-register QPE circuit for a^x ≡ b (mod p):
+    |x1⟩|x2⟩|1⟩ → |x1⟩|x2⟩|a^x1·b^x2 mod p⟩, then an inverse QFT on each exponent register.
+    """
+    t, m = register_sizes(p)
+    qc = QuantumCircuit(2 * t + m, 2 * t)
+    target = list(range(2 * t, 2 * t + m))
+
+    # Step 1: Apply Hadamards to both exponent registers
+    qc.h(range(2 * t))
 
     # Step 2: Initialize target to |1⟩ (modular identity)
-    qc.x(n_count)
+    qc.x(2 * t)
 
-    # Step 3: Placeholder for modular exponentiation
-    for i in range(n_count):
-        qc.cx(n_count, i)  # Mock controlled-unitaries
+    # Step 3: Controlled multiplications by a^(2^j) and b^(2^j)
+    for j in range(t):
+        qc.append(_controlled_mul_gate(a, p, m, 2**j), [j] + target)
+    for j in range(t):
+        qc.append(_controlled_mul_gate(b, p, m, 2**j), [t + j] + target)
+    qc.barrier()
 
-    # Step 4: Inverse QFT
-    qc.append(QFT(n_count, inverse=True, do_swaps=True).to_gate(label="QFT†"), range(n_count))
+    # Step 4: Inverse QFT on each exponent register
+    qc.append(qft_gate(t, inverse=True), range(t))
+    qc.append(qft_gate(t, inverse=True), range(t, 2 * t))
 
     # Step 5: Measure
-    qc.measure(range(n_count), range(n_count))
+    qc.measure(range(2 * t), range(2 * t))
+    return qc
+
 
-    print("📊 Schnorr’s Algorithm (Illustrative QPE for Discrete Log):")
+def discrete_log_statevector(a, b, p):
+    """Pre-measurement state of discrete_log_circuit, with each multiplication applied as a permutation gather"""
+    t, m = register_sizes(p)
+    n = 2 * t + m
+
+    psi = np.zeros(2**n, dtype=complex)
+    psi[2**(2 * t):2**(2 * t + 1)] = 1 / 2**t
+    target = range(2 * t, n)
+    for j in range(t):
+        apply_permutation(psi, modmul_permutation(a, p, m, 2**j), target, controls=(j,))
+        apply_permutation(psi, modmul_permutation(b, p, m, 2**j), target, controls=(t + j,))
+
+    apply_qft(psi, range(t), inverse=True)
+    return apply_qft(psi, range(t, 2 * t), inverse=True)
+
+
+def discrete_log_quantum(a, b, p, shots=16, seed=None):
+    """
+    Shor's discrete-log algorithm on the simulated two-register QPE circuit.
+    The order r of a is found first with Shor's order-finding QPE (Shors.find_period).
+    Each shot gives y1/2^t ≈ k/r and y2/2^t ≈ k·x/r; x = (k·x)·k⁻¹ mod r is kept only if it checks out.
+    """
+    t, _ = register_sizes(p)
+    rng = np.random.default_rng(seed)
+    r = find_period(a, p, shots=shots, seed=rng)
+    if r is None:
+        return None
+    probs = probabilities(discrete_log_statevector(a, b, p)).reshape(-1, 4**t).sum(axis=0)
+    samples, _ = sample_indices(probs, shots, rng)
+
+    for y in samples:
+        y1, y2 = int(y) % 2**t, int(y) // 2**t
+        k = round(y1 * r / 2**t) % r
+        kx = round(y2 * r / 2**t) % r
+        if gcd(k, r) != 1:
+            continue
+        x = kx * pow(k, -1, r) % r
+        if pow(a, x, p) == b % p:
+            return x
+    return None
+
+
+SOLVERS = {
+    'bruteforce': discrete_log_bruteforce,
+    'bsgs': discrete_log_bsgs,
+    'pollard_rho': discrete_log_pollard_rho,
+    'quantum': discrete_log_quantum,
+}
+
+
+def discrete_log(a, b, p, method='bsgs'):
+    """
+    Solve a^x ≡ b (mod p).
+    :param method: One of SOLVERS ('bsgs', 'pollard_rho', 'quantum', 'bruteforce').
+    """
+    if method not in SOLVERS:
+        raise ValueError(f"Unknown method '{method}', choose from {sorted(SOLVERS)}")
+    return SOLVERS[method](a, b, p)
+
+
+def time_solvers(a, b, p, methods=('bsgs', 'pollard_rho', 'quantum')):
+    """Run every back end on the same instance; returns {method: (x, seconds)}"""
+    results = {}
+    for method in methods:
+        start = time.perf_counter()
+        x = discrete_log(a, b, p, method)
+        results[method] = (x, time.perf_counter() - start)
+    return results
+
+
+def discrete_log_example(p=7, a=3, b=5):
+    """
+    Solve a^x ≡ b (mod p) with the classical and quantum back ends and time them.
+    """
+    print(f"🔐 Solving for x in {a}^x ≡ {b} (mod {p})")
+
+    for method, (x, seconds) in time_solvers(a, b, p, methods=tuple(SOLVERS)).items():
+        print(f"✅ {method:>11}: x = {x}  ({seconds * 1e3:.2f} ms)")
+
+    qc = discrete_log_circuit(a, b, p)
+    print("📊 Schnorr’s Algorithm (Two-register QPE for Discrete Log):")
     print(qc.draw())
     return
 
 
-discrete_log_example()
+def main():
+    parser = argparse.ArgumentParser(description="Discrete logarithm a^x ≡ b (mod p)")
+    parser.add_argument('--p', type=int, default=7)
+    parser.add_argument('--a', type=int, default=3)
+    parser.add_argument('--b', type=int, default=5)
+    args = parser.parse_args()
+    discrete_log_example(p=args.p, a=args.a, b=args.b)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,47 @@
 from qiskit import QuantumCircuit
-from qiskit.circuit.library import QFT
+from qiskit.circuit.library import UnitaryGate
+from math import gcd, lcm
 import numpy as np
-import matplotlib.pyplot as plt
+import argparse
+
+from qft import apply_qft, qft_gate
+from sampling import sample_indices
+from statevector_sim import apply_permutation, modmul_permutation, probabilities
+
+
+def register_sizes(N):
+    """Target register of m = N.bit_length() qubits and 2m counting qubits (enough to resolve r ≤ N)"""
+    m = N.bit_length()
+    return 2 * m, m
+
+
+def controlled_modmul_gate(a, N, m, power):
+    """Controlled-U^power for U|x⟩ = |a·x mod N⟩, built as a permutation unitary"""
+    perm = modmul_permutation(a, N, m, power)
+    mat = np.zeros((2**m, 2**m))
+    mat[perm, np.arange(2**m)] = 1
+    return UnitaryGate(mat, label=f"{a}^{power} mod {N}").control(1)
 
 
 def qpe_modular_exponentiation(a, N):
-    """Quantum Phase Estimation part of Shor's algorithm (illustrative)"""
-    # We're choosing 4 counting qubits (enough for N=15) and 4 target qubits
-    n_count = 4
-    qc = QuantumCircuit(n_count + 4, n_count)
+    """Quantum Phase Estimation part of Shor's algorithm"""
+    n_count, m = register_sizes(N)
+    qc = QuantumCircuit(n_count + m, n_count)
 
     # Apply Hadamard to counting qubits
     qc.h(range(n_count))
 
     # Initialize target register to 1
-    qc.x(n_count + 3)  # |0001⟩ = 1
+    qc.x(n_count)  # |0...01⟩ = 1
 
-    # Placeholder for controlled-U^2^j operations (mocking modular exponentiation)
+    # Controlled-U^(2^j) operations (modular exponentiation)
     for q in range(n_count):
-        qc.barrier()
-        qc.cx(n_count + 3, q)  # This is only a placeholder, not actual modular exponentiation
+        qc.append(controlled_modmul_gate(a, N, m, 2**q), [q] + list(range(n_count, n_count + m)))
 
     qc.barrier()
 
     # Apply inverse QFT
-    qc.append(QFT(num_qubits=n_count, inverse=True, do_swaps=True).to_gate(label="QFT†"), range(n_count))
+    qc.append(qft_gate(n_count, inverse=True), range(n_count))
 
     # Measure
     qc.measure(range(n_count), range(n_count))
@@ -32,10 +49,159 @@ def qpe_modular_exponentiation(a, N):
     return qc
 
 
-# Build circuit
-shor_circuit = qpe_modular_exponentiation(a=7, N=15)
-print("⚛️ Shor’s Algorithm (Illustrative QPE Circuit for N=15):")
-print(shor_circuit.draw())
+def _is_probable_prime(N):
+    """Deterministic Miller–Rabin for 64-bit N"""
+    if N < 2:
+        return False
+    for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        if N % p == 0:
+            return N == p
+    d, s = N - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        x = pow(a, d, N)
+        if x in (1, N - 1):
+            continue
+        for _ in range(s - 1):
+            x = pow(x, 2, N)
+            if x == N - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _perfect_power_root(N):
+    """Return b if N = b^k for some k ≥ 2, else None"""
+    for k in range(2, N.bit_length() + 1):
+        b = round(N ** (1 / k))
+        for c in (b - 1, b, b + 1):
+            if c > 1 and c**k == N:
+                return c
+    return None
+
+
+def classical_factor(N):
+    """
+    Classical fast path for the cases Shor's algorithm does not need a quantum computer for.
+    :return: A non-trivial factor of N (even N, perfect powers), or None.
+    """
+    if N % 2 == 0:
+        return 2
+    return _perfect_power_root(N)
+
+
+def qpe_statevector(a, N):
+    """
+    Pre-measurement state of qpe_modular_exponentiation(a, N), simulated natively.
+    Every controlled-U^(2^j) stage is one permutation gather, O(2^n) instead of O(4^n),
+    and the inverse QFT is a single FFT over the counting register.
+    """
+    n_count, m = register_sizes(N)
+    n = n_count + m
+
+    # H on the counting register, target register in |1⟩
+    psi = np.zeros(2**n, dtype=complex)
+    psi[2**n_count:2**(n_count + 1)] = 1 / np.sqrt(2**n_count)
+
+    target = range(n_count, n)
+    for j in range(n_count):
+        apply_permutation(psi, modmul_permutation(a, N, m, 2**j), target, controls=(j,))
+
+    return apply_qft(psi, range(n_count), inverse=True)
+
+
+def period_candidates(measured, n_count, N):
+    """Denominators r ≤ N of the continued-fraction convergents of measured/2^n_count"""
+    num, den = measured, 2**n_count
+    q_prev, q = 0, 1
+    candidates = []
+    while num:
+        t = den // num
+        den, num = num, den - t * num
+        q_prev, q = q, t * q + q_prev
+        if q > N:
+            break
+        candidates.append(q)
+    return candidates
+
+
+def find_period(a, N, shots=16, seed=None):
+    """
+    Run QPE on U|x⟩ = |a·x mod N⟩ and recover the order r of a modulo N.
+    With 2m counting bits the last convergent of a well-measured y is s/r in lowest terms,
+    so each shot yields one divisor r/gcd(s, r) of the order. Instead of searching multiples of
+    a divisor, the divisors of different shots are combined with an lcm until it verifies.
+    :return: The smallest verified period, or None if the shots did not reveal it.
+    """
+    n_count, _ = register_sizes(N)
+    probs = probabilities(qpe_statevector(a, N)).reshape(-1, 2**n_count).sum(axis=0)
+    # Repeated outcomes carry no new information: post-process each distinct y once
+    samples, _ = sample_indices(probs, shots, seed)
+
+    best = None
+    combined = 1
+    for y in samples:
+        convergents = period_candidates(int(y), n_count, N)
+        if not convergents:
+            continue
+        divisor = convergents[-1]
+        if lcm(combined, divisor) <= N:
+            combined = lcm(combined, divisor)
+        for r in (divisor, combined):
+            if pow(a, r, N) == 1:
+                best = r if best is None else min(best, r)
+    return best
+
+
+def shor_factor(N, shots=16, max_attempts=20, seed=None):
+    """
+    Factor N with Shor's algorithm.
+    Trivial cases (even N, perfect powers, lucky gcd hits) are answered classically;
+    otherwise the period of a random base is found with QPE and turned into factors.
+    :return: Tuple (p, q) with p·q = N and 1 < p ≤ q.
+    """
+    if N < 4 or _is_probable_prime(N):
+        raise ValueError(f"{N} has no non-trivial factors")
+    rng = np.random.default_rng(seed)
+
+    factor = classical_factor(N)
+    attempts = 0
+    while not factor and attempts < max_attempts:
+        attempts += 1
+        a = int(rng.integers(2, N - 1))
+        if gcd(a, N) > 1:
+            factor = gcd(a, N)
+            break
+
+        r = find_period(a, N, shots=shots, seed=rng)
+        if r is None or r % 2 or pow(a, r // 2, N) == N - 1:
+            continue
+        factor = gcd(pow(a, r // 2, N) - 1, N)
+        if factor in (1, N):
+            factor = None
+    if not factor:
+        raise RuntimeError(f"Failed to factor {N} in {max_attempts} attempts")
+    return tuple(sorted((factor, N // factor)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shor's factoring algorithm")
+    parser.add_argument('N', type=int, nargs='?', default=15, help="integer to factor (default: 15)")
+    parser.add_argument('--a', type=int, default=7, help="base of the drawn QPE circuit (default: 7)")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    # Build circuit
+    shor_circuit = qpe_modular_exponentiation(a=args.a, N=args.N)
+    print(f"⚛️ Shor’s Algorithm (QPE Circuit for a={args.a}, N={args.N}):")
+    print(shor_circuit.draw())
+
+    p, q = shor_factor(args.N, seed=args.seed)
+    print(f"✅ {args.N} = {p} × {q}")
+
 
-# ⚠️ This does not factor but demonstrates core phase estimation logic.
-# True Shor's requires a modular exponentiation unitary — non-trivial to simulate without Aer or native support.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Work-stealing scheduler for batched parameter sweeps (observe over many parameter sets).
+
+Rows 0..count-1 start out split into one contiguous range per worker (a QPU id or a
+slot of a process pool). The dispatcher
+
+- hands each worker chunks from the front of its own range, with at most
+  max_in_flight futures outstanding per worker (backpressure: nothing beyond that
+  is queued on a device or pickled to a process),
+- lets a worker whose range is empty steal the back half of the largest
+  remaining range, so fast workers keep going while slow ones drain,
+- sizes every chunk from that worker's measured seconds per row so one call
+  takes about target_seconds, which amortizes per-call overhead on fast devices
+  without leaving a long tail on slow ones,
+- writes results straight into a preallocated NumPy array and reports them in
+  row order through an optional on_result callback.
+
+A submit(worker, start, stop) callable returning a concurrent.futures.Future
+connects it to any backend: CUDA-Q observe_async (Cuda_Q/circuit_batching.py) or
+a local ProcessPoolExecutor (process_pool_observe below).
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import argparse
+import time
+
+import numpy as np
+
+from statevector_sim import apply_1q
+
+
+def _split(count, workers):
+    """Initial contiguous [start, stop) range per worker"""
+    edges = np.linspace(0, count, workers + 1).astype(int)
+    return [[int(edges[w]), int(edges[w + 1])] for w in range(workers)]
+
+
+def _take(ranges, worker, size):
+    """
+    Next chunk for worker: the front of its own range, after stealing the back half of
+    the largest remaining range when its own is empty. None when no rows are left.
+    """
+    own = ranges[worker]
+    if own[0] == own[1]:
+        victim = max(range(len(ranges)), key=lambda w: ranges[w][1] - ranges[w][0])
+        start, stop = ranges[victim]
+        if start == stop:
+            return None
+        half = max(1, (stop - start) // 2)
+        ranges[victim][1] = stop - half
+        own[0], own[1] = stop - half, stop
+    start = own[0]
+    own[0] = min(own[1], start + size)
+    return start, own[0]
+
+
+def schedule(submit, count, workers, out=None, max_in_flight=2, initial_batch=8,
+             min_batch=1, max_batch=4096, target_seconds=0.05, on_result=None):
+    """
+    Evaluate rows 0..count-1 through submit(worker, start, stop), a callable returning a
+    concurrent.futures.Future whose result holds the values of rows start..stop-1.
+    :param workers: Number of QPUs / process slots; worker ids are 0..workers-1.
+    :param out: Preallocated result array of length count (float64 of shape (count,) by default).
+    :param max_in_flight: Outstanding futures allowed per worker.
+    :param initial_batch: Chunk size used until a worker's latency has been measured.
+    :param target_seconds: Desired duration of one call; chunk sizes adapt towards it.
+    :param on_result: Optional callback(start, values) called in row order as results arrive.
+    :return: out, plus a stats dict with the chunks and rows each worker processed.
+    """
+    if out is None:
+        out = np.empty(count)
+    ranges = _split(count, workers)
+    seconds_per_row = [None] * workers
+    in_flight = [0] * workers
+    last_done = [0.0] * workers
+    stats = {'chunks': [0] * workers, 'rows': [0] * workers}
+    pending = {}
+    ready = {}
+    cursor = 0
+
+    def batch(worker):
+        if seconds_per_row[worker] is None:
+            return initial_batch
+        return int(np.clip(target_seconds / max(seconds_per_row[worker], 1e-9), min_batch, max_batch))
+
+    while True:
+        # Step 1: Top up every worker to max_in_flight chunks
+        for worker in range(workers):
+            while in_flight[worker] < max_in_flight:
+                chunk = _take(ranges, worker, batch(worker))
+                if chunk is None:
+                    break
+                future = submit(worker, *chunk)
+                pending[future] = (worker, *chunk, time.perf_counter())
+                in_flight[worker] += 1
+        if not pending:
+            break
+
+        # Step 2: Collect finished chunks and update each worker's latency estimate
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        now = time.perf_counter()
+        for future in done:
+            worker, start, stop, submitted = pending.pop(future)
+            out[start:stop] = future.result()
+            in_flight[worker] -= 1
+            stats['chunks'][worker] += 1
+            stats['rows'][worker] += stop - start
+            # Service time excludes the wait behind the worker's previous chunk
+            rate = (now - max(submitted, last_done[worker])) / (stop - start)
+            last_done[worker] = now
+            previous = seconds_per_row[worker]
+            seconds_per_row[worker] = rate if previous is None else 0.5 * (previous + rate)
+            ready[start] = stop
+
+        # Step 3: Stream the contiguous prefix of finished rows in order
+        while cursor in ready:
+            stop = ready.pop(cursor)
+            if on_result is not None:
+                on_result(cursor, out[cursor:stop])
+            cursor = stop
+    return out, stats
+
+
+def process_pool_observe(fn, parameters, processes=4, **kwargs):
+    """
+    Run fn(parameters[start:stop]) for all rows on a local process pool through schedule().
+    fn must be a picklable top-level function returning one value per row.
+    :return: (values, stats) as from schedule().
+    """
+    parameters = np.asarray(parameters)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return schedule(lambda worker, start, stop: pool.submit(fn, parameters[start:stop]),
+                        parameters.shape[0], processes, **kwargs)
+
+
+def _rx(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]])
+
+
+def rx_z0_expectations(parameters):
+    """
+    CPU stand-in for Cuda_Q/circuit_batching.py's kernel: rx(params[i]) on qubit i,
+    observed with Z on qubit 0, one statevector per parameter set.
+    """
+    parameters = np.atleast_2d(parameters)
+    n = parameters.shape[1]
+    z0 = np.where(np.arange(1 << n) & 1, -1.0, 1.0)
+    values = np.empty(parameters.shape[0])
+    for row, params in enumerate(parameters):
+        psi = np.zeros(1 << n, dtype=np.complex128)
+        psi[0] = 1
+        for q, theta in enumerate(params):
+            apply_1q(psi, _rx(theta), q)
+        values[row] = np.dot(np.abs(psi) ** 2, z0)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Work-stealing batched observe on a local process pool")
+    parser.add_argument('--sample-count', type=int, default=10000)
+    parser.add_argument('--qubit-count', type=int, default=5)
+    parser.add_argument('--processes', default='1,2,4', help="comma-separated pool sizes to compare")
+    parser.add_argument('--max-in-flight', type=int, default=2)
+    parser.add_argument('--target-seconds', type=float, default=0.05)
+    args = parser.parse_args()
+
+    parameters = np.random.default_rng(13).uniform(0, 1, size=(args.sample_count, args.qubit_count))
+    expected = np.cos(parameters[:, 0])
+    for processes in (int(p) for p in args.processes.split(',')):
+        start = time.perf_counter()
+        values, stats = process_pool_observe(rx_z0_expectations, parameters, processes,
+                                             max_in_flight=args.max_in_flight,
+                                             target_seconds=args.target_seconds)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  {processes} processes: {elapsed:.3f} s, chunks per worker {stats['chunks']}, "
+              f"rows per worker {stats['rows']}, max error {np.max(np.abs(values - expected)):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Batched-parameter statevector engine for parameterized circuits.
+
+Cuda_Q/circuit_batching.py evaluates one small kernel per parameter set, so
+10,000 parameter sets cost 10,000 launches. Here all parameter sets share one
+amplitude tensor with one row per parameter set:
+
+- rx/ry/rz/p gates whose angle depends on circuit Parameters get one angle per
+  row and are applied with broadcasting,
+- fixed gates are the same for every row and act on all rows at once,
+- ⟨H⟩ for every row comes out of one pass per Pauli term.
+
+A circuit with g gates therefore costs g NumPy passes over batch·2^n amplitudes
+instead of batch·g tiny ones. Internally the tensor is stored as (2^n, batch):
+with the batch as the contiguous last axis, per-row angles broadcast along
+unit-stride memory even for gates on qubit 0. simulate() returns the
+(batch, 2^n) transpose. Rows are processed in chunks that fit a memory budget.
+"""
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate, ParameterExpression, ParameterVector
+from qiskit.quantum_info import Operator
+import numpy as np
+
+from pauli_sum import from_list, from_sparse_pauli_op, parity
+from statevector_sim import mix_pair
+
+ROTATIONS = {'rx', 'ry', 'rz', 'p'}
+
+
+def zero_states(batch: int, n: int) -> np.ndarray:
+    """(2^n, batch) tensor with every column |0...0⟩"""
+    psi = np.zeros((1 << n, batch), dtype=np.complex128)
+    psi[0] = 1
+    return psi
+
+
+def apply_rotation(psi: np.ndarray, name: str, theta, qubit: int) -> np.ndarray:
+    """
+    Apply rx/ry/rz/p with one angle per column to qubit, in place.
+    :param psi: (2^n, batch) amplitudes.
+    :param theta: (batch,) angles (a scalar applies the same angle to every column).
+    """
+    v = psi.reshape(-1, 2, 1 << qubit, psi.shape[1])
+    a, b = v[:, 0], v[:, 1]
+    if name == 'rz':
+        a *= np.exp(-0.5j * theta)
+        b *= np.exp(0.5j * theta)
+    elif name == 'p':
+        b *= np.exp(1j * theta)
+    elif name in ('rx', 'ry'):
+        c, s = np.cos(theta / 2), np.sin(theta / 2)
+        m01, m10 = (-1j * s, -1j * s) if name == 'rx' else (-s, s)
+        tmp = a.copy()
+        a *= c
+        a += m01 * b
+        b *= c
+        b += m10 * tmp
+    else:
+        raise ValueError(f"Unknown rotation '{name}'")
+    return psi
+
+
+def apply_gate(psi: np.ndarray, mat: np.ndarray, qubits, controls=(), ctrl_state=None) -> np.ndarray:
+    """
+    Apply a fixed gate to every column of a (2^n, batch) tensor, the batched counterpart of
+    statevector_sim's apply_1q / apply_unitary / apply_controlled (the batch is one more trailing axis).
+    :param qubits: Target qubits (qubits[0] is the least significant bit of mat's index).
+    :return: The updated tensor (a new array for multi-qubit dense gates).
+    """
+    n = psi.shape[0].bit_length() - 1
+    batch = psi.shape[1]
+    if controls:
+        if ctrl_state is None:
+            ctrl_state = (1 << len(controls)) - 1
+        index = [slice(None)] * (n + 1)
+        for k, c in enumerate(controls):
+            index[n - 1 - c] = (ctrl_state >> k) & 1
+        view = psi.reshape((2,) * n + (batch,))[tuple(index)]
+        axis = (n - 1 - qubits[0]) - sum(1 for c in controls if c > qubits[0])
+        v = np.moveaxis(view, axis, 0)
+        mix_pair(v[:1], v[1:], mat)
+        return psi
+    if len(qubits) == 1:
+        v = psi.reshape(-1, 2, (1 << qubits[0]) * batch)
+        mix_pair(v[:, 0], v[:, 1], mat)
+        return psi
+    k = len(qubits)
+    t = psi.reshape((2,) * n + (batch,))
+    axes = [n - 1 - q for q in reversed(qubits)]
+    out = np.tensordot(mat.reshape((2,) * (2 * k)), t, axes=(list(range(k, 2 * k)), axes))
+    return np.moveaxis(out, range(k), axes).reshape(psi.shape)
+
+
+def _angle(value, index, num_parameters):
+    """
+    Angle of a gate as (weights over the parameters, offset), i.e. θ = parameters @ weights + offset.
+    Affine expressions such as 2*θ[0] - θ[1] + 0.5 are supported; anything else raises.
+    """
+    weights = np.zeros(num_parameters)
+    if not isinstance(value, ParameterExpression):
+        return weights, float(value)
+    params = list(value.parameters)
+    offset = float(value.bind({p: 0 for p in params}))
+    for p in params:
+        weights[index[p]] = float(value.bind({q: float(q is p) for q in params})) - offset
+    probe = np.random.default_rng(0).uniform(-1, 1, len(params))
+    if not np.isclose(float(value.bind(dict(zip(params, probe)))),
+                      offset + sum(weights[index[p]] * x for p, x in zip(params, probe))):
+        raise ValueError(f"Only affine parameter expressions are supported, got {value}")
+    return weights, offset
+
+
+def compile_circuit(qc):
+    """
+    Flatten a parameterized circuit into steps: ('rotation', name, qubit, weights, offset) for
+    parameter-dependent rotations and ('gate', mat, qubits, controls, ctrl_state) for fixed gates.
+    Parameters are ordered as qc.parameters; final measurements and barriers are skipped.
+    """
+    index = {p: k for k, p in enumerate(qc.parameters)}
+    steps = []
+    for instruction in qc.data:
+        op = instruction.operation
+        qubits = [qc.find_bit(q).index for q in instruction.qubits]
+        if op.name in ('barrier', 'id', 'delay', 'measure'):
+            continue
+        if op.name in ROTATIONS and isinstance(op.params[0], ParameterExpression):
+            steps.append(('rotation', op.name, qubits[0], *_angle(op.params[0], index, len(index))))
+        elif op.is_parameterized():
+            raise ValueError(f"Parameterized '{op.name}' is not supported; use rx/ry/rz/p rotations")
+        elif isinstance(op, ControlledGate) and op.base_gate.num_qubits == 1 and op.num_qubits > 2:
+            k = op.num_ctrl_qubits
+            mat = Operator(op.base_gate).data
+            if op.name == 'cu':
+                mat = mat * np.exp(1j * float(op.params[3]))  # γ is a relative phase once controlled
+            steps.append(('gate', mat, (qubits[k],), tuple(qubits[:k]), op.ctrl_state))
+        else:
+            steps.append(('gate', Operator(op).data, tuple(qubits), (), None))
+    return steps
+
+
+def _run(steps, parameters, n):
+    """(2^n, batch) final amplitudes for a (batch, num_parameters) array"""
+    psi = zero_states(parameters.shape[0], n)
+    for step in steps:
+        if step[0] == 'rotation':
+            _, name, qubit, weights, offset = step
+            apply_rotation(psi, name, parameters @ weights + offset, qubit)
+        else:
+            psi = apply_gate(psi, *step[1:])
+    return psi
+
+
+def _check(qc, parameters):
+    parameters = np.atleast_2d(np.asarray(parameters, dtype=float))
+    if parameters.shape[1] != qc.num_parameters:
+        raise ValueError(f"Expected {qc.num_parameters} parameters per row, got {parameters.shape[1]}")
+    return parameters
+
+
+def simulate(qc, parameters) -> np.ndarray:
+    """
+    Final amplitudes of qc for every parameter set.
+    :param parameters: (batch, len(qc.parameters)) array, columns ordered as qc.parameters.
+    :return: (batch, 2^n) complex array (a transposed view of the internal tensor).
+    """
+    return _run(compile_circuit(qc), _check(qc, parameters), qc.num_qubits).T
+
+
+def pauli_terms(observable, n):
+    """(x masks, z masks, coefficients) of a pauli_sum dict, SparsePauliOp or Pauli label (qubit 0 rightmost)"""
+    if isinstance(observable, str):
+        observable = from_list([(observable, 1)], n)
+    elif not isinstance(observable, dict):
+        observable = from_sparse_pauli_op(observable)
+    return observable['x'].astype(np.int64), observable['z'].astype(np.int64), observable['coeffs']
+
+
+def expectation_values(psi: np.ndarray, observable) -> np.ndarray:
+    """
+    ⟨ψ|H|ψ⟩ for every row of a (batch, 2^n) array.
+    :param observable: pauli_sum dict, SparsePauliOp / Pauli label, or a (2^n,) real diagonal.
+    P = i^{x·z} X^x Z^z acts as P|j⟩ = i^{x·z} (−1)^{j·z} |j ⊕ x⟩, so each term is one gather
+    and a signed inner product; Z-only terms share the probabilities.
+    """
+    psi = psi.T  # (2^n, batch), contiguous for arrays coming from simulate()
+    n = psi.shape[0].bit_length() - 1
+    probs = psi.real ** 2 + psi.imag ** 2
+    if isinstance(observable, np.ndarray):
+        return observable @ probs
+    x, z, coeffs = pauli_terms(observable, n)
+    j = np.arange(1 << n, dtype=np.int64)
+    values = np.zeros(psi.shape[1], dtype=np.complex128)
+
+    diagonal = x == 0
+    if diagonal.any():
+        signs = 1 - 2 * parity(j[None, :] & z[diagonal, None])
+        values += (coeffs[diagonal] @ signs) @ probs
+    for xm, zm, c in zip(x[~diagonal], z[~diagonal], coeffs[~diagonal]):
+        phase = 1j ** bin(int(xm & zm)).count('1')
+        signs = 1 - 2 * parity(j & zm)
+        values += c * phase * np.einsum('jb,jb->b', psi[j ^ xm].conj(), psi * signs[:, None])
+    return values.real
+
+
+def observe(qc, observable, parameters, memory_budget=256 * 2**20) -> np.ndarray:
+    """
+    ⟨H⟩ for every parameter set in one call, the batched counterpart of cudaq.observe(kernel, h, parameters).
+    :param memory_budget: Bytes of amplitudes per chunk of rows.
+    :return: (batch,) real expectation values.
+    """
+    parameters = _check(qc, parameters)
+    steps = compile_circuit(qc)
+    rows = max(1, memory_budget // (16 << qc.num_qubits))
+    out = np.empty(parameters.shape[0])
+    for start in range(0, parameters.shape[0], rows):
+        psi = _run(steps, parameters[start:start + rows], qc.num_qubits)
+        out[start:start + rows] = expectation_values(psi.T, observable)
+    return out
+
+
+def rx_kernel_circuit(qubit_count=5):
+    """Cuda_Q/circuit_batching.py's kernel(params): rx(params[i]) on qubit i"""
+    params = ParameterVector('params', qubit_count)
+    qc = QuantumCircuit(qubit_count)
+    for i in range(qubit_count):
+        qc.rx(params[i], i)
+    return qc
@@ -0,0 +1,17 @@
+"""
+Reproducible benchmark suite for the algorithms and simulation backends.
+
+Every case is warmed up, timed over several repeats (median and IQR are
+reported), re-run once under tracemalloc for its peak memory, appended to a
+JSON-lines/CSV history and optionally compared against a stored baseline.
+Everything runs on the CPU backends; CUDA-Q targets are opt-in parameters.
+
+    python -m benchmarks                      # quick sizes, all algorithms
+    python -m benchmarks --only grover,ghz --full
+    python -m benchmarks --save-baseline      # record the reference medians
+    python -m benchmarks --compare            # flag regressions (exit code 1)
+    python -m benchmarks --cudaq-targets qpp-cpu,nvidia
+"""
+from benchmarks.harness import compare, load_baseline, measure, run_suite, save_baseline, write_history
+
+__all__ = ['compare', 'load_baseline', 'measure', 'run_suite', 'save_baseline', 'write_history']
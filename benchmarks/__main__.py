@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+
+from benchmarks.cases import FULL, QUICK, collect, describe
+from benchmarks.harness import compare, load_baseline, run_suite, save_baseline, write_history
+
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Reproducible benchmarks of every algorithm and CPU backend")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--quick', action='store_true', help="small problem sizes (default)")
+    size.add_argument('--full', action='store_true', help="larger problem sizes")
+    parser.add_argument('--only', help="comma-separated algorithms, e.g. grover,ghz")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed runs before timing")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak-memory run")
+    parser.add_argument('--cudaq-targets', default='',
+                        help="optional CUDA-Q targets, e.g. qpp-cpu,nvidia,nvidia-mqpu")
+    parser.add_argument('--out-dir', default=RESULTS, help="where history.jsonl/history.csv are appended")
+    parser.add_argument('--baseline', help="baseline file (default <out-dir>/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="store these medians as the baseline")
+    parser.add_argument('--compare', action='store_true', help="exit with status 1 on regressions against the baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="relative slowdown counted as a regression")
+    parser.add_argument('--list', action='store_true', help="print the cases and exit")
+    args = parser.parse_args()
+
+    only = set(args.only.split(',')) if args.only else None
+    targets = [t for t in args.cudaq_targets.split(',') if t]
+    if args.list:
+        for line in describe(FULL if args.full else QUICK):
+            print(line)
+        return 0
+
+    print(f"🚀 Running {'full' if args.full else 'quick'} benchmarks "
+          f"(warmup {args.warmup}, repeat {args.repeat})")
+    records = run_suite(collect(args.full, only, targets), args.warmup, args.repeat, not args.no_memory)
+    write_history(records, args.out_dir)
+    print(f"📝 Appended {len(records)} results to {os.path.join(args.out_dir, 'history.jsonl')} and history.csv")
+
+    baseline_path = args.baseline or os.path.join(args.out_dir, 'baseline.json')
+    status = 0
+    if args.compare:
+        baseline = load_baseline(baseline_path)
+        if not baseline:
+            print(f"⚠️  No baseline at {baseline_path}; run with --save-baseline first")
+        else:
+            regressions = compare(records, baseline, args.threshold)
+            for name, before, after, ratio in regressions:
+                print(f"❌ {name}: {before * 1e3:.2f} ms → {after * 1e3:.2f} ms ({ratio:.2f}x)")
+            if regressions:
+                status = 1
+            else:
+                print(f"✅ No regressions beyond {args.threshold:.0%} against {baseline_path}")
+    if args.save_baseline:
+        save_baseline(records, baseline_path)
+        print(f"💾 Baseline saved to {baseline_path}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
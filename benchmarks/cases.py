@@ -0,0 +1,179 @@
+"""
+Benchmark cases: every algorithm of the repo on the CPU backends that can run it.
+
+Each factory yields (algorithm, backend, size, fn) tuples. Circuits and inputs are
+built once per case, outside fn, so the timings cover simulation and sampling only.
+"""
+import importlib
+import os
+import sys
+
+import numpy as np
+
+import batched_sim
+import circuit_opt
+import oracle_analysis
+import sharded_sim
+import sparse_sim
+import stabilizer_sim
+from batch_scheduler import rx_z0_expectations
+from boolean_oracles import deutsch_jozsa_classify, random_balanced_function
+from dj import deutsch_jozsa
+from grover import grover_algorithm, grover_statevector, optimal_iterations
+from qsimon import solve_simon
+from sampling import sample_indices
+from Shors import shor_factor
+
+SEED = 1234
+SHOTS = 1000
+
+# Problem sizes (qubits, or N for Shor) per backend
+QUICK = {
+    'grover': {'numpy': [10, 14, 18], 'circuit_opt': [8, 10]},
+    'bv': {'product': [16, 64], 'stabilizer': [64, 256]},
+    'dj': {'numpy': [10, 16], 'product': [16, 64]},
+    'simon': {'numpy': [8, 12]},
+    'shor': {'numpy': [15, 21, 35]},
+    'ghz': {'stabilizer': [100, 1000], 'sparse': [20, 30], 'circuit_opt': [16], 'sharded': [16]},
+    'observe': {'numpy-loop': [1000], 'numpy-batched': [1000, 10000]},
+}
+FULL = {
+    'grover': {'numpy': [10, 14, 18, 22], 'circuit_opt': [8, 10, 12]},
+    'bv': {'product': [16, 64, 256], 'stabilizer': [64, 256, 1000]},
+    'dj': {'numpy': [10, 16, 20], 'product': [16, 64, 256]},
+    'simon': {'numpy': [8, 12, 16]},
+    'shor': {'numpy': [15, 21, 35, 143]},
+    'ghz': {'stabilizer': [100, 1000, 5000], 'sparse': [20, 30, 60], 'circuit_opt': [16, 20, 24],
+            'sharded': [16, 20, 24]},
+    'observe': {'numpy-loop': [1000, 10000], 'numpy-batched': [1000, 10000, 100000]},
+}
+SHARDED_PROCESSES = (1, 2, 4)
+
+
+def _secret(n):
+    """Reproducible random bitstring of length n with at least one 1"""
+    bits = np.random.default_rng(SEED + n).integers(0, 2, n)
+    bits[-1] = 1
+    return ''.join(map(str, bits))
+
+
+def grover_cases(sizes):
+    for n in sizes.get('numpy', []):
+        target = _secret(n)
+        rounds = optimal_iterations(n)
+        yield 'grover', 'numpy', n, lambda n=n, t=target, k=rounds: grover_statevector(n, t, k)
+    for n in sizes.get('circuit_opt', []):
+        qc = grover_algorithm(n, _secret(n), optimal_iterations(n))
+        yield 'grover', 'circuit_opt', n, lambda qc=qc: circuit_opt.simulate(qc)
+
+
+def bv_cases(sizes):
+    bernstein_vazirani = importlib.import_module('Bernstein-Vazirani').bernstein_vazirani
+    for backend, run in (('product', oracle_analysis.sample_counts), ('stabilizer', stabilizer_sim.sample_counts)):
+        for n in sizes.get(backend, []):
+            qc = bernstein_vazirani(_secret(n))
+            yield 'bv', backend, n, lambda qc=qc, run=run: run(qc, SHOTS, seed=SEED)
+
+
+def dj_cases(sizes):
+    for n in sizes.get('numpy', []):
+        table = random_balanced_function(n, seed=SEED)
+        yield 'dj', 'numpy', n, lambda n=n, table=table: deutsch_jozsa_classify(table, n)
+    for n in sizes.get('product', []):
+        qc = deutsch_jozsa(n, True)
+        yield 'dj', 'product', n, lambda qc=qc: oracle_analysis.sample_counts(qc, SHOTS, seed=SEED)
+
+
+def simon_cases(sizes):
+    for n in sizes.get('numpy', []):
+        yield 'simon', 'numpy', n, lambda mask=_secret(n): solve_simon(mask, seed=SEED)
+
+
+def shor_cases(sizes):
+    for N in sizes.get('numpy', []):
+        yield 'shor', 'numpy', N, lambda N=N: shor_factor(N, seed=SEED)
+
+
+def ghz_cases(sizes, processes=SHARDED_PROCESSES):
+    for n in sizes.get('stabilizer', []):
+        qc = sharded_sim.ghz_circuit(n)
+        yield 'ghz', 'stabilizer', n, lambda qc=qc: stabilizer_sim.sample_counts(qc, SHOTS, seed=SEED)
+    for n in sizes.get('sparse', []):
+        qc = sharded_sim.ghz_circuit(n)
+        yield 'ghz', 'sparse', n, lambda qc=qc: sparse_sim.sample_counts(qc, SHOTS, seed=SEED)
+    for n in sizes.get('circuit_opt', []):
+        qc = sharded_sim.ghz_circuit(n)
+        yield 'ghz', 'circuit_opt', n, lambda qc=qc: sample_indices(np.abs(circuit_opt.simulate(qc)) ** 2, SHOTS, SEED)
+    for n in sizes.get('sharded', []):
+        for p in processes:
+            yield ('ghz', f'sharded-cpu-{p}', n,
+                   lambda n=n, p=p: sharded_sim.sample_ghz_state(n, processes=p, shots=SHOTS, seed=SEED))
+
+
+def observe_cases(sizes, qubit_count=5):
+    """
+    ⟨Z0⟩ of Cuda_Q/circuit_batching.py's rx(params[i]) kernel for many parameter sets,
+    one statevector per parameter set (numpy-loop) or one batched tensor (numpy-batched).
+    """
+    for count in sizes.get('numpy-loop', []):
+        parameters = np.random.default_rng(13).uniform(0, 1, size=(count, qubit_count))
+        yield 'observe', 'numpy-loop', count, lambda p=parameters: rx_z0_expectations(p)
+    kernel = batched_sim.rx_kernel_circuit(qubit_count)
+    z0 = 'I' * (qubit_count - 1) + 'Z'
+    for count in sizes.get('numpy-batched', []):
+        parameters = np.random.default_rng(13).uniform(0, 1, size=(count, qubit_count))
+        yield 'observe', 'numpy-batched', count, lambda p=parameters: batched_sim.observe(kernel, z0, p)
+
+
+def cudaq_cases(targets, sizes):
+    """
+    GHZ sampling (Cuda_Q/first.py) and batched observe (Cuda_Q/circuit_batching.py) on the
+    given CUDA-Q targets, e.g. 'qpp-cpu', 'nvidia' or 'nvidia-mqpu'. Only imported when asked for.
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Cuda_Q'))
+    import cudaq
+    from cudaq import spin
+    from first import kernel as ghz_kernel
+    from circuit_batching import kernel as rx_kernel
+
+    def on(target, fn):
+        name, _, option = target.partition('-')
+        if option:
+            cudaq.set_target(name, option=option)
+        else:
+            cudaq.set_target(name)
+        return fn()
+
+    for target in targets:
+        for n in sizes['ghz'].get('sparse', []):
+            if n <= 30:
+                yield ('ghz', f'cudaq:{target}', n,
+                       lambda t=target, n=n: on(t, lambda: cudaq.sample(ghz_kernel, n, shots_count=SHOTS)))
+        for count in sizes['observe'].get('numpy-loop', []):
+            parameters = np.random.default_rng(13).uniform(0, 1, size=(count, 5))
+            yield ('observe', f'cudaq:{target}', count,
+                   lambda t=target, p=parameters: on(t, lambda: cudaq.observe(rx_kernel, spin.z(0), p)))
+
+
+FACTORIES = {
+    'grover': grover_cases, 'bv': bv_cases, 'dj': dj_cases, 'simon': simon_cases,
+    'shor': shor_cases, 'ghz': ghz_cases, 'observe': observe_cases,
+}
+
+
+def collect(full=False, only=None, cudaq_targets=()):
+    """All cases for the chosen sizes, optionally restricted to some algorithms"""
+    sizes = FULL if full else QUICK
+    for algorithm, factory in FACTORIES.items():
+        if only is None or algorithm in only:
+            yield from factory(sizes[algorithm])
+    if cudaq_targets:
+        for case in cudaq_cases(cudaq_targets, sizes):
+            if only is None or case[0] in only:
+                yield case
+
+
+def describe(sizes):
+    """One line per algorithm listing its backends and sizes"""
+    return [f"{algorithm}: " + ', '.join(f"{backend} {values}" for backend, values in backends.items())
+            for algorithm, backends in sizes.items()]
@@ -0,0 +1,140 @@
+"""
+Timing, memory and history helpers behind the benchmark suite.
+"""
+from datetime import datetime, timezone
+import csv
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+
+FIELDS = ['timestamp', 'commit', 'host', 'algorithm', 'backend', 'size', 'repeat',
+          'median_s', 'iqr_s', 'min_s', 'max_s', 'peak_mb']
+
+
+def measure(fn, warmup=1, repeat=5, track_memory=True):
+    """
+    Time fn() after `warmup` untimed calls.
+    :return: dict with median/IQR/min/max seconds over `repeat` runs and the peak traced
+        allocation in MB of one extra run (NumPy buffers included; memory of worker
+        processes, e.g. the sharded simulator's shared block, is not traced).
+    """
+    for _ in range(warmup):
+        fn()
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return {'repeat': repeat, 'median_s': median, 'iqr_s': q3 - q1,
+            'min_s': min(times), 'max_s': max(times), 'peak_mb': peak_mb}
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def key(record):
+    """Identity of a benchmark point across runs"""
+    return f"{record['algorithm']}/{record['backend']}/{record['size']}"
+
+
+def run_suite(cases, warmup=1, repeat=5, track_memory=True, log=print):
+    """
+    Run (algorithm, backend, size, fn) cases and return one record per case.
+    A case that raises is reported and skipped so one missing backend does not stop the suite.
+    """
+    stamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    commit = _commit()
+    host = f"{platform.node()} {platform.machine()} {os.cpu_count()} cpus"
+    records = []
+    for algorithm, backend, size, fn in cases:
+        try:
+            stats = measure(fn, warmup, repeat, track_memory)
+        except Exception as error:
+            log(f"⚠️  {algorithm:8s} {backend:18s} {size!s:>6}  skipped: {error}")
+            continue
+        record = {'timestamp': stamp, 'commit': commit, 'host': host,
+                  'algorithm': algorithm, 'backend': backend, 'size': size, **stats}
+        records.append(record)
+        peak = f"{record['peak_mb']:8.1f} MB" if record['peak_mb'] is not None else ''
+        log(f"⏱️  {algorithm:8s} {backend:18s} {size!s:>6}  median {record['median_s'] * 1e3:10.2f} ms"
+            f"  IQR {record['iqr_s'] * 1e3:8.2f} ms  {peak}")
+    return records
+
+
+def write_history(records, out_dir):
+    """Append records to history.jsonl and history.csv in out_dir"""
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, 'history.jsonl'), 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+    path = os.path.join(out_dir, 'history.csv')
+    new = not os.path.exists(path)
+    with open(path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction='ignore')
+        if new:
+            writer.writeheader()
+        writer.writerows(records)
+
+
+def save_baseline(records, path):
+    """Store median/IQR per benchmark point as the reference for later comparisons"""
+    baseline = load_baseline(path)
+    for record in records:
+        baseline[key(record)] = {'median_s': record['median_s'], 'iqr_s': record['iqr_s'],
+                                 'commit': record['commit'], 'timestamp': record['timestamp']}
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    """Baseline dictionary keyed by 'algorithm/backend/size' (empty when the file is missing)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(records, baseline, threshold=0.2):
+    """
+    Flag points whose median slowed down by more than `threshold` relative to the
+    baseline and by more than twice the combined IQR, so timer noise is not reported.
+    :return: List of (key, baseline median, new median, ratio) for the regressions.
+    """
+    regressions = []
+    for record in records:
+        ref = baseline.get(key(record))
+        if ref is None:
+            continue
+        slower = record['median_s'] - ref['median_s']
+        noise = 2 * (record['iqr_s'] + ref['iqr_s'])
+        if slower > threshold * ref['median_s'] and slower > noise:
+            regressions.append((key(record), ref['median_s'], record['median_s'],
+                                record['median_s'] / ref['median_s']))
+    return regressions
@@ -0,0 +1,166 @@
+"""
+Gate cancellation and fusion before statevector simulation.
+
+Every gate costs one pass over the 2^n amplitudes, and the circuits here carry a
+lot of redundancy: Simon's explicit oracle uncomputes and recomputes X layers
+between consecutive table entries, Grover's oracle and diffuser stack X and H
+layers, and runs of single-qubit gates could be one 2x2 matrix. The pass
+
+1. cancels adjacent inverse pairs (X·X, H·H, S·S†, CX·CX, mcx·mcx, ...),
+2. fuses gates greedily into blocks acting on at most max_block qubits (k ≤ 5),
+   so a run of single-qubit gates becomes one 2x2 matrix and a cluster of gates
+   on the same few qubits becomes one 2^k x 2^k matrix,
+3. drops blocks that multiply out to the identity.
+
+Wide multi-controlled gates are kept as controlled 2x2 operations and applied
+on their control slice only. The result runs on the statevector_sim routines.
+"""
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate
+from qiskit.circuit.library import UnitaryGate
+from qiskit.quantum_info import Operator
+import numpy as np
+
+from statevector_sim import apply_controlled, apply_unitary, zero_state
+
+_SELF_INVERSE = {'x', 'y', 'z', 'h', 'cx', 'cy', 'cz', 'ch', 'swap', 'ccx', 'ccz', 'mcx', 'cswap'}
+_MAX_DENSE_GATE = 10  # wider gates without controlled structure are decomposed
+
+
+def _instructions(qc, max_block):
+    """
+    Flatten qc into ops: {'qubits', 'mat'} for dense gates or, for wide controlled
+    gates, {'qubits', 'mat', 'controls', 'ctrl_state', 'target'}. Final measurements are skipped.
+    """
+    for instruction in qc.data:
+        op = instruction.operation
+        qubits = tuple(qc.find_bit(q).index for q in instruction.qubits)
+        if op.name in ('barrier', 'id', 'delay', 'measure'):
+            continue
+        if op.name in ('reset',) or instruction.clbits:
+            raise ValueError(f"Cannot fuse non-unitary operation '{op.name}'")
+        if (isinstance(op, ControlledGate) and op.base_gate.num_qubits == 1
+                and op.num_qubits > max_block):
+            k = op.num_ctrl_qubits
+            mat = Operator(op.base_gate).data
+            if op.name == 'cu':
+                mat = mat * np.exp(1j * float(op.params[3]))  # γ is a relative phase once controlled
+            yield {'name': op.name, 'qubits': qubits, 'mat': mat,
+                   'controls': qubits[:k], 'ctrl_state': op.ctrl_state, 'target': qubits[k]}
+        elif op.num_qubits <= _MAX_DENSE_GATE or op.definition is None:
+            yield {'name': op.name, 'qubits': qubits, 'mat': Operator(op).data}
+        else:
+            inner = QuantumCircuit(qc.num_qubits)
+            inner.append(op, qubits)
+            yield from _instructions(inner.decompose(), max_block)
+
+
+def _is_inverse(a, b):
+    """True when op b undoes op a (same qubits in the same order)"""
+    if a['qubits'] != b['qubits'] or ('controls' in a) != ('controls' in b):
+        return False
+    if 'controls' in a:
+        if a['ctrl_state'] != b['ctrl_state']:
+            return False
+    elif a['name'] == b['name'] and a['name'] in _SELF_INVERSE:
+        return True
+    product = b['mat'] @ a['mat']
+    return np.allclose(product, np.eye(product.shape[0]))
+
+
+def cancel_inverses(ops):
+    """
+    Peephole cancellation of adjacent inverse pairs, cascading through newly exposed pairs.
+    Each qubit keeps a stack of the live ops that touch it; a new op cancels against the
+    op on top of all of its qubits' stacks.
+    """
+    live = []
+    stacks = {}
+    for op in ops:
+        tops = {id(stacks[q][-1]) if stacks.get(q) else None for q in op['qubits']}
+        if len(tops) == 1 and None not in tops:
+            previous = stacks[op['qubits'][0]][-1]
+            if set(previous['qubits']) == set(op['qubits']) and _is_inverse(previous, op):
+                for q in op['qubits']:
+                    stacks[q].pop()
+                previous['cancelled'] = True
+                continue
+        live.append(op)
+        for q in op['qubits']:
+            stacks.setdefault(q, []).append(op)
+    return [op for op in live if not op.get('cancelled')]
+
+
+def _embed(mat, qubits, order):
+    """Matrix of a gate on `qubits` acting on the register `order` (order[0] is the least significant bit)"""
+    k = len(order)
+    rest = [q for q in order if q not in qubits]
+    full = np.kron(np.eye(1 << len(rest)), mat)
+    current = list(qubits) + rest
+    axes = [k - 1 - current.index(order[k - 1 - j]) for j in range(k)]
+    t = full.reshape((2,) * (2 * k)).transpose(axes + [k + a for a in axes])
+    return t.reshape(1 << k, 1 << k)
+
+
+def fuse(ops, max_block=4):
+    """
+    Greedy block fusion. An op joins the latest block touching any of its qubits when
+    that block is the last one on every shared qubit and the union stays within max_block
+    qubits; otherwise it opens a new block. Wide controlled ops always stand alone.
+    """
+    blocks = []
+    frontier = {}
+    for op in ops:
+        latest = max((frontier[q] for q in op['qubits'] if q in frontier), default=None)
+        if 'controls' not in op and latest is not None and 'controls' not in blocks[latest]:
+            block = blocks[latest]
+            union = list(block['qubits']) + [q for q in op['qubits'] if q not in block['qubits']]
+            if len(union) <= max_block:
+                block['mat'] = _embed(op['mat'], op['qubits'], union) @ _embed(block['mat'], block['qubits'], union)
+                block['qubits'] = tuple(union)
+                for q in op['qubits']:
+                    frontier[q] = latest
+                continue
+        blocks.append(dict(op))
+        for q in op['qubits']:
+            frontier[q] = len(blocks) - 1
+    return [b for b in blocks if 'controls' in b or not np.allclose(b['mat'], np.eye(b['mat'].shape[0]))]
+
+
+def optimize(qc, max_block=4):
+    """
+    Cancellation plus fusion for qc.
+    :param max_block: Largest fused block in qubits (1..5); 4 keeps each dense block cheap
+        next to the memory-bound pass over the statevector.
+    :return: List of blocks, each {'qubits', 'mat'} or a wide controlled op with 'controls'/'target'.
+    """
+    if not 1 <= max_block <= 5:
+        raise ValueError("max_block must be between 1 and 5 qubits")
+    return fuse(cancel_inverses(_instructions(qc, max_block)), max_block)
+
+
+def to_circuit(blocks, num_qubits):
+    """QuantumCircuit of UnitaryGate blocks, for drawing or checking a fused program"""
+    qc = QuantumCircuit(num_qubits)
+    for block in blocks:
+        if 'controls' in block:
+            gate = UnitaryGate(block['mat']).control(len(block['controls']), ctrl_state=block['ctrl_state'])
+            qc.append(gate, list(block['controls']) + [block['target']])
+        else:
+            qc.append(UnitaryGate(block['mat'], check_input=False), list(block['qubits']))
+    return qc
+
+
+def apply_blocks(psi, blocks):
+    """Run optimized blocks on the dense amplitudes psi; returns the final amplitudes"""
+    for block in blocks:
+        if 'controls' in block:
+            apply_controlled(psi, block['mat'], block['target'], block['controls'], block['ctrl_state'])
+        else:
+            psi = apply_unitary(psi, block['mat'], block['qubits'])
+    return psi
+
+
+def simulate(qc, max_block=4):
+    """Optimize qc and run it from |0...0⟩; returns the final amplitudes as a NumPy array"""
+    return apply_blocks(zero_state(qc.num_qubits), optimize(qc, max_block))
@@ -3,9 +3,23 @@ from qiskit.quantum_info import Statevector
 from qiskit.visualization import (
     plot_histogram,
     plot_bloch_multivector,
+    plot_bloch_vector,
     plot_state_city
 )
-import matplotlib.pyplot as plt
+import argparse
+import numpy as np
+
+from plotting import add_arguments as add_plot_arguments, circuit_figure, configure_from_args, render, wait
+from statevector_sim import (
+    basis_index,
+    bloch_vectors,
+    index_bits,
+    uniform_state,
+    phase_flip,
+    reflect_about_mean,
+    probabilities,
+    sample_counts
+)
 
 
 def grover_oracle(qc, target):
@@ -33,59 +47,220 @@ def diffuser(qc, n):
     qc.h(range(n))
 
 
-def grover_algorithm(n, target_bin):
+def grover_algorithm(n, target_bin, iterations=1):
     """Grover circuit for n-qubit with one marked state"""
     qc = QuantumCircuit(n, n)
 
     # Step 1: Initialize superposition
     qc.h(range(n))
 
-    # Step 2: Apply Oracle
-    grover_oracle(qc, target_bin)
-    qc.barrier()
+    for _ in range(iterations):
+        # Step 2: Apply Oracle
+        grover_oracle(qc, target_bin)
+        qc.barrier()
 
-    # Step 3: Apply Diffuser
-    diffuser(qc, n)
-    qc.barrier()
+        # Step 3: Apply Diffuser
+        diffuser(qc, n)
+        qc.barrier()
 
     # Step 4: Measure
     qc.measure(range(n), range(n))
     return qc
 
 
-# Parameters
-n = 7
-target_state = '1101101'
+def grover_statevector(n, targets, iterations=1, dtype=np.float64):
+    """
+    Native NumPy Grover run: the oracle is one vectorized sign flip on the marked
+    indices and the diffuser one in-place reflection about the mean, so each
+    iteration is O(2^n) with no multi-controlled gate decomposition.
+    :param targets: Marked bitstring or list of bitstrings (character i is qubit i).
+    :param iterations: Number of oracle+diffuser rounds.
+    """
+    marked = _marked_indices(targets)
+
+    psi = uniform_state(n, dtype=dtype)
+    for _ in range(iterations):
+        phase_flip(psi, marked)
+        reflect_about_mean(psi)
+    return psi
+
+
+def _marked_indices(targets):
+    """Sorted, de-duplicated basis indices of the marked bitstrings"""
+    if isinstance(targets, str):
+        targets = [targets]
+    return np.unique(np.fromiter((basis_index(t) for t in targets), dtype=np.int64, count=len(targets)))
+
+
+def optimal_iterations(n, m=1):
+    """Optimal number of Grover rounds ⌊π/4·√(N/M)⌋ for M marked states out of N = 2^n"""
+    N = 1 << n
+    if not 0 < m <= N:
+        raise ValueError(f"Number of marked states must be in 1..{N}, got {m}")
+    return int(np.floor(np.pi / 4 * np.sqrt(N / m)))
+
+
+def success_probabilities(n, m, iterations):
+    """Exact success probability sin²((2k+1)θ), sin θ = √(M/N), after k = 0..iterations rounds"""
+    theta = np.arcsin(np.sqrt(m / (1 << n)))
+    k = np.arange(iterations + 1)
+    return np.sin((2 * k + 1) * theta) ** 2
+
+
+def shots_for_confidence(p_success, confidence=0.99):
+    """Smallest shot count that sees a marked state at least once with the given confidence"""
+    if p_success >= 1:
+        return 1
+    if p_success <= 0:
+        raise ValueError("Success probability is zero; no shot count reaches the target confidence")
+    return max(1, int(np.ceil(np.log1p(-confidence) / np.log1p(-p_success))))
+
+
+def grover_search(n, targets, iterations=None, shots=None, confidence=0.99, seed=None):
+    """
+    Grover driver for any set of M marked states.
+    Runs the optimal ⌊π/4·√(N/M)⌋ rounds unless iterations is given, records the
+    success probability after every round and, when shots is None, samples only as
+    many shots as needed to observe a marked state with the requested confidence.
+    :return: dict with 'counts', 'iterations', 'success_probability' (entry k is after k rounds) and 'shots'.
+    """
+    marked = _marked_indices(targets)
+    if iterations is None:
+        iterations = optimal_iterations(n, marked.size)
+
+    psi = uniform_state(n)
+    history = [marked.size / (1 << n)]
+    for _ in range(iterations):
+        phase_flip(psi, marked)
+        reflect_about_mean(psi)
+        hit = psi[marked]
+        history.append(float(np.dot(hit, hit)))
+
+    if shots is None:
+        shots = shots_for_confidence(history[-1], confidence)
+    return {
+        'counts': sample_counts(psi, shots, seed=seed),
+        'iterations': iterations,
+        'success_probability': history,
+        'shots': shots,
+    }
+
+
+def bbht_search(n, targets, growth=6 / 5, max_queries=None, seed=None):
+    """
+    Boyer–Brassard–Høyer–Tapp exponential search for an unknown number of marked states.
+    Each round draws j uniformly from [0, m), runs j Grover rounds, measures once and
+    checks the outcome classically; m grows by `growth` up to √N after every miss.
+    :param max_queries: Oracle-call budget (default 9·√N); None is returned as the
+        result if it is exhausted, which is how an empty marked set shows up.
+    :return: dict with 'result' (bitstring, character i is qubit i), 'queries' and
+        'rounds' as a list of (j, success probability) pairs.
+    """
+    N = 1 << n
+    marked = _marked_indices(targets)
+    is_marked = np.zeros(N, dtype=bool)
+    is_marked[marked] = True
+    if max_queries is None:
+        max_queries = int(np.ceil(9 * np.sqrt(N)))
+    rng = np.random.default_rng(seed)
+
+    m, queries, rounds = 1.0, 0, []
+    while queries <= max_queries:
+        j = int(rng.integers(0, int(m)))
+        psi = uniform_state(n)
+        for _ in range(j):
+            phase_flip(psi, marked)
+            reflect_about_mean(psi)
+        queries += j
+
+        p = probabilities(psi)
+        p /= p.sum()
+        rounds.append((j, float(p[marked].sum())))
+        x = int(rng.choice(N, p=p))
+        if is_marked[x]:
+            return {'result': index_bits(x, n), 'queries': queries, 'rounds': rounds}
+        m = min(growth * m, np.sqrt(N))
+    return {'result': None, 'queries': queries, 'rounds': rounds}
+
+
+def grover_batch(n, targets, iterations=None, shots=1000, memory_budget=256 * 2**20, seed=None):
+    """
+    Batched Grover sweep: one single-target search per entry of targets.
+    Amplitudes are kept as a (batch, 2^n) array and the oracle/diffuser are applied
+    to every row at once with NumPy broadcasting. Rows are processed in chunks so
+    the working set (amplitudes plus probabilities) stays under memory_budget bytes.
+    :param targets: Marked bitstrings (character i is qubit i), one search each.
+    :return: List of Qiskit-style count dictionaries, in the order of targets.
+    """
+    if iterations is None:
+        iterations = optimal_iterations(n)
+    marked = np.fromiter((basis_index(t) for t in targets), dtype=np.int64, count=len(targets))
+    N = 1 << n
+    rows_per_chunk = max(1, memory_budget // (2 * N * np.dtype(np.float64).itemsize))
+    rng = np.random.default_rng(seed)
+
+    results = []
+    for start in range(0, marked.size, rows_per_chunk):
+        chunk = marked[start:start + rows_per_chunk]
+        rows = np.arange(chunk.size)
+        psi = np.full((chunk.size, N), 1 / np.sqrt(N))
+        for _ in range(iterations):
+            psi[rows, chunk] *= -1
+            mean = psi.mean(axis=1, keepdims=True)
+            np.negative(psi, out=psi)
+            psi += 2 * mean
+
+        np.square(psi, out=psi)
+        psi /= psi.sum(axis=1, keepdims=True)
+        hits = rng.multinomial(shots, psi)
+        for row in hits:
+            idx = np.flatnonzero(row)
+            results.append({format(int(i), f'0{n}b'): int(row[i]) for i in idx})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grover's search with the native NumPy statevector engine")
+    parser.add_argument('--target', default='1101101', help="marked bitstring, character i is qubit i")
+    parser.add_argument('--shots', type=int, default=1000)
+    add_plot_arguments(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+
+    # Parameters
+    target_state = args.target
+    n = len(target_state)
+
+    iterations = optimal_iterations(n)
+    print(f"🔁 Optimal Grover iterations for n={n}: {iterations}")
+    print(f"🎯 Success probability: {success_probabilities(n, 1, iterations)[-1]:.4f}")
+
+    # Build Grover circuit
+    grover_circuit = grover_algorithm(n, target_state, iterations)
+
+    # Show circuit diagram (draw as image)
+    render(circuit_figure, grover_circuit, title="Grover's Algorithm Circuit")
 
-# Build Grover circuit
-grover_circuit = grover_algorithm(n, target_state)
+    # Simulate with the native NumPy engine for pre-measurement insights
+    # (same state as evolving grover_circuit up to a global phase, without decomposing the mcx gates)
+    final_sv = Statevector(grover_statevector(n, target_state, iterations).astype(complex))
 
-# Show circuit diagram (draw as image)
-grover_circuit.draw(output='mpl')
-plt.title("Grover's Algorithm Circuit")
-plt.show()
+    # Plot: Full Bloch Multivector (all qubits together)
+    render(plot_bloch_multivector, final_sv, title="Bloch Multivector: Full State")
 
-# Simulate using Statevector for pre-measurement insights
-init_sv = Statevector.from_label('0'*n)
-final_sv = init_sv.evolve(grover_circuit.remove_final_measurements(inplace=False))
+    # Plot: Bloch sphere for individual qubits (all n Bloch vectors in one pass over the amplitudes)
+    for i, vector in enumerate(bloch_vectors(final_sv.data)):
+        print(f"🧭 Qubit {i} Bloch vector (X, Y, Z): {np.round(vector, 4)}")
+        render(plot_bloch_vector, vector, title=f"Bloch Sphere for Qubit {i}")
 
-# Plot: Full Bloch Multivector (all qubits together)
-plot_bloch_multivector(final_sv)
-plt.title("Bloch Multivector: Full State")
-plt.show()
+    # Plot: State vector city (real/imag amplitudes)
+    render(plot_state_city, final_sv, title="Statevector after Grover Iteration")
 
-# Plot: Bloch sphere for individual qubits
-for i in range(n):
-    plot_bloch_multivector(final_sv.ptrace(i))
-    plt.title(f"Bloch Sphere for Qubit {i}")
-    plt.show()
+    # Plot: Output histogram (simulated measurement results)
+    counts = sample_counts(final_sv.data, args.shots)
+    render(plot_histogram, counts, title=f"Measurement Outcomes (Target = '{target_state}')")
+    wait()
 
-# Plot: State vector city (real/imag amplitudes)
-plot_state_city(final_sv, title="Statevector after Grover Iteration")
-plt.show()
 
-# Plot: Output histogram (simulated measurement results)
-counts = final_sv.sample_counts(1000)
-plot_histogram(counts)
-plt.title("Measurement Outcomes (Target = '101')")
-plt.show()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+Measurement planning for shot-based ⟨H⟩ estimates.
+
+A shot-based observe naively measures every Pauli term in its own basis, so a
+100,000-term Hamiltonian needs 100,000 circuits. Terms that commute can share
+samples:
+
+- qubit-wise commuting (QWC) groups agree letter by letter wherever both terms
+  act, so one layer of single-qubit rotations (H for X, S†·H for Y) turns every
+  member into a Z-string,
+- fully commuting groups share an eigenbasis too; a Clifford V with
+  V·P·V† = ±Z^v for every member is built on a stabilizer_sim tableau holding
+  the members, by diagonalizing the group's independent generators one by one.
+
+QWC groups are built greedily (terms by decreasing |c|, first group that accepts
+the term) on the packed masks of pauli_sum; fully commuting groups merge QWC
+groups, so they never need more circuits than the QWC plan. Each group becomes one measurement
+circuit, and every term expectation is rebuilt from that group's shots as a
+signed parity of the measured bits.
+
+A plan is a dict {'n', 'groups', 'bases', 'z_masks', 'signs'}: term ids per group,
+the basis change per group as a list of (gate name, qubits) tuples, and per term the
+measured-bit mask and sign. measurement_circuits turns the bases into circuits; the CPU
+path applies them directly with statevector_sim.
+
+observe_to_precision spends shots adaptively instead of a fixed count per
+circuit: one shot of group k yields Y_k = Σ c_i s_i (−1)^{|b∧v_i|}, so
+⟨H⟩ = Σ_k E[Y_k] with standard error sqrt(Σ_k σ_k² / N_k). For a total budget
+this is smallest with N_k ∝ σ_k (the per-group form of shots ∝ |c_i|·σ_i, with
+covariances inside a group included), and eps is reached after
+(Σ_k σ_k)² / eps² shots.
+"""
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
+import numpy as np
+
+import stabilizer_sim
+from pauli_sum import parity
+from sampling import sample_indices
+from statevector_sim import H as HADAMARD, apply_1q
+
+_GATES = {'h': HADAMARD, 's': np.diag([1, 1j]), 'sdg': np.diag([1, -1j])}
+
+
+def _greedy_qubitwise(H, order):
+    """First-fit QWC grouping; each group keeps the union of its members' letters as x/z masks"""
+    x, z = H['x'], H['z']
+    group = np.empty(x.size, dtype=np.int64)
+    gx = np.zeros(1024, dtype=np.uint64)
+    gz = np.zeros(1024, dtype=np.uint64)
+    count = 0
+    for t in order:
+        tx, tz = x[t], z[t]
+        if count:
+            # Letters must agree on every qubit where both the group and the term act
+            clash = ((gx[:count] ^ tx) | (gz[:count] ^ tz)) & (gx[:count] | gz[:count]) & (tx | tz)
+            k = int(np.argmin(clash))
+            if clash[k] == 0:
+                gx[k] |= tx
+                gz[k] |= tz
+                group[t] = k
+                continue
+        if count == gx.size:
+            gx, gz = np.concatenate((gx, np.zeros_like(gx))), np.concatenate((gz, np.zeros_like(gz)))
+        gx[count], gz[count] = tx, tz
+        group[t] = count
+        count += 1
+    return group, gx[:count], gz[:count]
+
+
+def _split_groups(group):
+    """Term ids per group from the group id of every term, in one sort"""
+    order = np.argsort(group, kind='stable')
+    return np.split(order, np.cumsum(np.bincount(group))[:-1])
+
+
+def _independent(x, z, basis=None):
+    """
+    Indices of the packed Pauli rows (x, z) that are GF(2)-independent of basis and of each other.
+    :param basis: Echelon basis {pivot bit: packed row}, extended in place (a new one by default).
+    """
+    basis = {} if basis is None else basis
+    keep = []
+    for i, (a, b) in enumerate(zip(x.tolist(), z.tolist())):
+        row = (a << 64) | b
+        while row:
+            top = row.bit_length() - 1
+            if top not in basis:
+                basis[top] = row
+                keep.append(i)
+                break
+            row ^= basis[top]
+    return keep
+
+
+def _merge_commuting(H, qwc_groups):
+    """
+    Greedily merge QWC groups (largest first) into fully commuting groups: a QWC group joins
+    the first merged group it commutes with. Commutation is bilinear, so it suffices to test the
+    independent generators of both sides, at most n rows each, instead of every placed term.
+    """
+    x, z = H['x'], H['z']
+    gen_x = np.zeros(1024, dtype=np.uint64)
+    gen_z = np.zeros(1024, dtype=np.uint64)
+    gen_owner = np.zeros(1024, dtype=np.int64)
+    rows = 0
+    spans, merged = [], []
+    for k in sorted(range(len(qwc_groups)), key=lambda k: -qwc_groups[k].size):
+        members = qwc_groups[k]
+        own = members[_independent(x[members], z[members])]
+        tx, tz = x[own], z[own]
+        target = len(spans)
+        if rows:
+            anti = parity((tx[:, None] & gen_z[:rows]) ^ (tz[:, None] & gen_x[:rows]), H['n']).any(axis=0)
+            free = np.flatnonzero(np.bincount(gen_owner[:rows], weights=anti, minlength=len(spans)) == 0)
+            if free.size:
+                target = int(free[0])
+        if target == len(spans):
+            spans.append({})
+            merged.append([])
+        merged[target].append(members)
+
+        # Generators of this group that enlarge the merged group's span
+        new = _independent(tx, tz, spans[target])
+        if rows + len(new) > gen_x.size:
+            gen_x, gen_z, gen_owner = (np.concatenate((a, np.zeros_like(a))) for a in (gen_x, gen_z, gen_owner))
+        gen_x[rows:rows + len(new)] = tx[new]
+        gen_z[rows:rows + len(new)] = tz[new]
+        gen_owner[rows:rows + len(new)] = target
+        rows += len(new)
+    return [np.sort(np.concatenate(m)) for m in merged]
+
+
+def _diagonalize(n, x, z):
+    """
+    Clifford gates V with V·P·V† = ±Z^v for every row of a commuting set of Paulis.
+    The rows live in a stabilizer_sim tableau, so each gate conjugates all of them (signs included).
+    Per independent generator: CX from the pivot to clear its other X bits, S when the pivot
+    holds a Y, then H, which leaves the generator diagonal; diagonal rows stay diagonal under later steps.
+    :return: (gates, z masks, signs) of the conjugated rows.
+    """
+    rows = {'n': n, 'x': x.astype(np.uint64)[:, None].copy(), 'z': z.astype(np.uint64)[:, None].copy(),
+            'r': np.zeros(x.size, dtype=np.uint8)}
+    gates = []
+    for i in _independent(x, z):
+        bits = int(rows['x'][i, 0])
+        if not bits:
+            continue
+        q = (bits & -bits).bit_length() - 1
+        for p in range(q + 1, n):
+            if (bits >> p) & 1:
+                stabilizer_sim.cx(rows, q, p)
+                gates.append(('cx', (q, p)))
+        if (int(rows['z'][i, 0]) >> q) & 1:
+            stabilizer_sim.s(rows, q)
+            gates.append(('s', (q,)))
+        stabilizer_sim.h(rows, q)
+        gates.append(('h', (q,)))
+    if rows['x'].any():
+        raise ValueError("Group members do not commute")
+    return gates, rows['z'][:, 0], np.where(rows['r'], -1.0, 1.0)
+
+
+def _qubitwise_basis(n, gx, gz):
+    """Rotation layer measuring the letters gx/gz: H for X, S†·H for Y, nothing for Z and I"""
+    gates = []
+    for q in range(n):
+        bx, bz = (int(gx) >> q) & 1, (int(gz) >> q) & 1
+        if bx and bz:
+            gates.append(('sdg', (q,)))
+        if bx:
+            gates.append(('h', (q,)))
+    return gates
+
+
+def plan(H: dict, commuting='qubitwise') -> dict:
+    """
+    Partition the terms of a pauli_sum into measurement groups.
+    :param commuting: 'qubitwise' (one rotation layer per group, greedy over packed masks)
+        or 'full' (fewer groups, a Clifford basis change per group).
+    """
+    n = H['n']
+    order = np.argsort(-np.abs(H['coeffs']), kind='stable')
+    z_masks = np.zeros(H['x'].size, dtype=np.uint64)
+    signs = np.ones(H['x'].size)
+    bases = []
+
+    if commuting == 'qubitwise':
+        group, gx, gz = _greedy_qubitwise(H, order)
+        groups = _split_groups(group)
+        bases = [_qubitwise_basis(n, a, b) for a, b in zip(gx, gz)]
+        z_masks = H['x'] | H['z']  # after the rotations every acted-on qubit is read in Z
+    elif commuting == 'full':
+        group, _, _ = _greedy_qubitwise(H, order)
+        groups = _merge_commuting(H, _split_groups(group))
+        for members in groups:
+            basis, z_masks[members], signs[members] = _diagonalize(n, H['x'][members], H['z'][members])
+            bases.append(basis)
+    else:
+        raise ValueError("commuting must be 'qubitwise' or 'full'")
+    return {'n': n, 'groups': groups, 'bases': bases, 'z_masks': z_masks, 'signs': signs}
+
+
+def measurement_circuits(qc, measurement_plan) -> list:
+    """One circuit per group: the state preparation qc, the group's basis change and measure_all()"""
+    circuits = []
+    for basis in measurement_plan['bases']:
+        circuit = qc.remove_final_measurements(inplace=False)
+        for name, qubits in basis:
+            getattr(circuit, name)(*qubits)
+        circuit.measure_all()
+        circuits.append(circuit)
+    return circuits
+
+
+def _as_indices(result):
+    """(indices, counts) arrays from a Qiskit-style counts dict or an (indices, counts) pair"""
+    if isinstance(result, dict):
+        keys = list(result)
+        indices = np.fromiter((int(k.replace(' ', ''), 2) for k in keys), dtype=np.int64, count=len(keys))
+        return indices, np.fromiter(result.values(), dtype=np.int64, count=len(keys))
+    return result
+
+
+def term_values(measurement_plan, results) -> np.ndarray:
+    """
+    Every term expectation rebuilt from its group's shots.
+    :param results: Per group, a counts dict over all qubits or (indices, counts) arrays.
+    """
+    values = np.zeros(measurement_plan['z_masks'].size)
+    for members, result in zip(measurement_plan['groups'], results):
+        indices, counts = _as_indices(result)
+        masks = measurement_plan['z_masks'][members].astype(np.int64)
+        parities = parity(indices[None, :].astype(np.int64) & masks[:, None])
+        values[members] = measurement_plan['signs'][members] * ((1 - 2 * parities) @ counts) / counts.sum()
+    return values
+
+
+def estimate(H: dict, measurement_plan, results) -> float:
+    """⟨H⟩ = Σ c_i ⟨P_i⟩ from the shots of every group"""
+    return float(np.real(term_values(measurement_plan, results) @ H['coeffs']))
+
+
+def _rotate(psi, basis) -> np.ndarray:
+    """
+    ψ (a copy) in a group's basis: H/S/S† with statevector_sim.apply_1q, and every run of CX
+    gates sharing a control (the fan-outs of _diagonalize) as one XOR permutation j → j ⊕ j_c·mask.
+    """
+    psi = np.array(psi, dtype=np.complex128)
+    j = np.arange(psi.size)
+    k = 0
+    while k < len(basis):
+        name, qubits = basis[k]
+        if name != 'cx':
+            apply_1q(psi, _GATES[name], qubits[0])
+            k += 1
+            continue
+        control, mask = qubits[0], 0
+        while k < len(basis) and basis[k][0] == 'cx' and basis[k][1][0] == control:
+            mask |= 1 << basis[k][1][1]
+            k += 1
+        psi = psi[j ^ (((j >> control) & 1) * mask)]
+    return psi
+
+
+def _layer(basis, n):
+    """Gate names per qubit when basis only has single-qubit gates, else None"""
+    names = [()] * n
+    for name, qubits in basis:
+        if len(qubits) != 1:
+            return None
+        names[qubits[0]] += (name,)
+    return tuple(names)
+
+
+def _layer_matrix(names):
+    mat = np.eye(2, dtype=np.complex128)
+    for name in names:
+        mat = _GATES[name] @ mat
+    return mat
+
+
+def _rotated_probabilities(psi, bases, which):
+    """
+    Yield (k, probabilities of ψ in bases[k]) for the groups in which.
+    Single-qubit layers (every QWC plan) are visited in sorted order on one working copy of ψ,
+    and each step only re-rotates the qubits whose letter changed, by U_new·U_old†.
+    Other bases are rotated from ψ each time.
+    """
+    n = np.asarray(psi).size.bit_length() - 1
+    layers = [_layer(bases[k], n) for k in which]
+    if any(layer is None for layer in layers):
+        for k in which:
+            rotated = _rotate(psi, bases[k])
+            yield k, rotated.real ** 2 + rotated.imag ** 2
+        return
+    work = np.array(psi, dtype=np.complex128)
+    current = [()] * n
+    matrices = {}
+    for layer, k in sorted(zip(layers, which)):
+        for q, names in enumerate(layer):
+            if names != current[q]:
+                for key in (names, current[q]):
+                    if key not in matrices:
+                        matrices[key] = _layer_matrix(key)
+                apply_1q(work, matrices[names] @ matrices[current[q]].conj().T, q)
+                current[q] = names
+        yield k, work.real ** 2 + work.imag ** 2
+
+
+def sample_groups(psi, measurement_plan, shots=1000, seed=None) -> list:
+    """
+    CPU execution of a plan: draw shots of ψ in each group's basis.
+    :param shots: Shots per group, or an array with one count per group (groups with 0 get None).
+    :return: Per group, (indices, counts) arrays as from sampling.sample_indices.
+    """
+    group_count = len(measurement_plan['groups'])
+    shots = np.broadcast_to(shots, (group_count,))
+    seeds = np.random.SeedSequence(seed).spawn(group_count)
+    results = [None] * group_count
+    which = [k for k in range(group_count) if shots[k]]
+    for k, p in _rotated_probabilities(np.asarray(psi), measurement_plan['bases'], which):
+        results[k] = sample_indices(p, int(shots[k]), seeds[k])
+    return results
+
+
+def _group_statistics(H, measurement_plan, k, result):
+    """(shots, Σ Y, Σ Y²) of group k's per-shot value Y = Σ_i c_i s_i (−1)^{|b∧v_i|}"""
+    members = measurement_plan['groups'][k]
+    indices, counts = _as_indices(result)
+    masks = measurement_plan['z_masks'][members].astype(np.int64)
+    weights = measurement_plan['signs'][members] * H['coeffs'][members].real
+    y = weights @ (1 - 2 * parity(indices[None, :].astype(np.int64) & masks[:, None]))
+    return counts.sum(), y @ counts, (y * y) @ counts
+
+
+def observe_to_precision(state, H: dict, eps: float, commuting='qubitwise', pilot_shots=100,
+                         max_shots=10**8, max_rounds=20, growth=4.0, sampler=None, seed=None):
+    """
+    Estimate ⟨H⟩ to a standard error below eps, spending shots where the variance is.
+    Round 0 draws pilot_shots per group; every following round re-estimates σ_k and tops each
+    group up towards N_k = σ_k Σ_j σ_j / eps² (at most growth times its current shots, so a noisy
+    pilot cannot overspend), until the combined standard error is below eps.
+    :param state: QuantumCircuit without final measurements, Statevector or amplitude array.
+    :param sampler: Optional sampler(k, shots, rng) returning counts or (indices, counts) for group k
+        (e.g. a device running measurement_circuits(qc, plan)[k]); by default every round is one
+        sample_groups sweep over ψ on the CPU, so no per-group state is kept between rounds.
+    :return: (estimate, standard error, total shots).
+    """
+    measurement_plan = plan(H, commuting)
+    group_count = len(measurement_plan['groups'])
+    rng = np.random.default_rng(seed)
+    if sampler is None:
+        if isinstance(state, QuantumCircuit):
+            state = state.remove_final_measurements(inplace=False)
+        psi = Statevector(state).data
+
+    # Largest possible σ_k: members with a nonzero mask can each swing by |c_i|
+    bound = np.array([np.abs(H['coeffs'][m].real)[measurement_plan['z_masks'][m] != 0].sum()
+                      for m in measurement_plan['groups']])
+    shots = np.zeros(group_count, dtype=np.int64)
+    total = np.zeros(group_count)
+    squares = np.zeros(group_count)
+    new = np.where(bound > 0, pilot_shots, 1)
+    for _ in range(max_rounds):
+        # Step 1: Draw this round's shots and accumulate per-group moments
+        if sampler is None:
+            results = sample_groups(psi, measurement_plan, new, seed=int(rng.integers(1 << 63)))
+        else:
+            results = [sampler(k, int(new[k]), rng) if new[k] else None for k in range(group_count)]
+        for k in np.flatnonzero(new):
+            n_k, y, y2 = _group_statistics(H, measurement_plan, k, results[k])
+            shots[k] += n_k
+            total[k] += y
+            squares[k] += y2
+
+        # Step 2: Standard error, with one pseudo-shot at the maximum variance so that groups
+        # whose few shots happened to agree are not starved
+        means = total / shots
+        sample_var = np.maximum(squares / shots - means ** 2, 0) * shots / np.maximum(shots - 1, 1)
+        var = (shots * sample_var + bound ** 2) / (shots + 1)
+        error = float(np.sqrt(np.sum(var / shots)))
+        if error < eps or shots.sum() >= max_shots:
+            break
+
+        # Step 3: Top groups up towards the allocation N_k ∝ σ_k that reaches eps
+        sigma = np.sqrt(var)
+        target = np.ceil(sigma * sigma.sum() / eps ** 2)
+        new = np.clip(target - shots, 0, (growth - 1) * shots).astype(np.int64)
+        if not new.any():
+            new = np.where(bound > 0, shots, 0)  # allocation met but error above eps: double
+        room = max_shots - shots.sum()
+        if new.sum() > room:
+            new = np.floor(new * room / new.sum()).astype(np.int64)
+    return float(means.sum()), error, int(shots.sum())
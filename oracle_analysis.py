@@ -0,0 +1,139 @@
+"""
+Structural fast path for oracle circuits such as Bernstein–Vazirani and Deutsch–Jozsa.
+
+Phase oracles of linear functions (CX fan-in to an ancilla prepared in |−⟩,
+sandwiched between Hadamard layers) never entangle the register: every qubit
+stays in one of the Pauli eigenstates |0⟩, |1⟩, |+⟩, |−⟩ and the CX gates only
+kick a Z back onto their controls. Tracking that product state gate by gate
+gives the exact output distribution in O(gates); anything that would entangle
+falls back to sparse_sim (whose memory follows the support and which only
+densifies narrow circuits), or to the stabilizer tableau in stabilizer_sim when
+only shots of a Clifford circuit are needed.
+"""
+import numpy as np
+
+import sparse_sim
+import stabilizer_sim
+
+# Single-qubit product states: '0', '1', '+', '-'
+_H = {'0': '+', '1': '-', '+': '0', '-': '1'}
+_X = {'0': '1', '1': '0', '+': '+', '-': '-'}
+_Z = {'0': '0', '1': '1', '+': '-', '-': '+'}
+_Y = {'0': '1', '1': '0', '+': '-', '-': '+'}
+_SINGLE = {'h': _H, 'x': _X, 'z': _Z, 'y': _Y}
+
+
+def track_product_state(qc, initial=None):
+    """
+    Propagate a product of Pauli eigenstates through qc.
+    :param initial: Optional starting states per qubit (default all '0').
+    :return: (states, measured) with measured a {clbit: qubit} map, or None if the
+        circuit leaves the product-state class (non-linear oracle, unsupported gate).
+    """
+    states = list(initial) if initial is not None else ['0'] * qc.num_qubits
+    measured = {}
+    done = set()
+
+    for instruction in qc.data:
+        name = instruction.operation.name
+        qubits = [qc.find_bit(q).index for q in instruction.qubits]
+        if name == 'barrier':
+            continue
+        if done.intersection(qubits):
+            return None  # gates after a mid-circuit measurement
+        if name == 'measure':
+            measured[qc.find_bit(instruction.clbits[0]).index] = qubits[0]
+            done.add(qubits[0])
+        elif name in _SINGLE:
+            states[qubits[0]] = _SINGLE[name][states[qubits[0]]]
+        elif name == 'id':
+            continue
+        elif name == 'cx':
+            c, t = qubits
+            if states[c] in '01':
+                if states[c] == '1':
+                    states[t] = _X[states[t]]
+            elif states[t] in '+-':
+                if states[t] == '-':
+                    states[c] = _Z[states[c]]  # phase kickback
+            else:
+                return None  # control in superposition, target in Z basis: entangling
+        elif name == 'cz':
+            a, b = qubits
+            if states[a] in '01':
+                if states[a] == '1':
+                    states[b] = _Z[states[b]]
+            elif states[b] in '01':
+                if states[b] == '1':
+                    states[a] = _Z[states[a]]
+            else:
+                return None
+        elif name == 'swap':
+            a, b = qubits
+            states[a], states[b] = states[b], states[a]
+        else:
+            return None
+    return states, measured
+
+
+def output_distribution(qc, max_random_bits=20):
+    """
+    Exact measurement distribution of qc as {bitstring: probability} (Qiskit clbit order).
+    Linear phase-oracle circuits are answered structurally, everything else is simulated
+    on sparse_sim (which raises MemoryError rather than building a huge dense state).
+    :raises ValueError: When the answer has more than max_random_bits uniformly random
+        outcomes; sample_counts draws shots of such circuits on the stabilizer tableau.
+    """
+    tracked = track_product_state(qc)
+    if tracked is not None:
+        states, measured = tracked
+        random_bits = [c for c, q in measured.items() if states[q] in '+-']
+        if len(random_bits) > max_random_bits:
+            raise ValueError(f"Distribution has 2^{len(random_bits)} equally likely outcomes "
+                             f"(max_random_bits={max_random_bits}); use sample_counts instead")
+        bits = ['0'] * qc.num_clbits
+        for c, q in measured.items():
+            if states[q] in '01':
+                bits[c] = states[q]
+        p = 1 / 2**len(random_bits)
+        dist = {}
+        for k in range(2**len(random_bits)):
+            for j, c in enumerate(random_bits):
+                bits[c] = str((k >> j) & 1)
+            dist[''.join(reversed(bits))] = p
+        return dist
+
+    state, measured = sparse_sim.simulate(qc)
+    indices, probs = sparse_sim.probabilities(state)
+    keys = np.zeros(indices.size, dtype=np.int64)
+    for c, q in measured.items():
+        keys |= ((indices >> q) & 1) << c
+    merged, inverse = np.unique(keys, return_inverse=True)
+    totals = np.bincount(inverse, weights=probs)
+    dist = {}
+    for k, p in zip(merged, totals):
+        if p > 0:
+            dist[format(int(k), f'0{qc.num_clbits}b') if qc.num_clbits else ''] = float(p)
+    return dist
+
+
+def sample_counts(qc, shots=1024, seed=None, max_random_bits=20):
+    """
+    Draw shots from qc with one multinomial call over output_distribution(qc).
+    Clifford circuits that leave the product-state class, or whose distribution has
+    more than 2^max_random_bits outcomes, are sampled on the stabilizer tableau instead.
+    """
+    tracked = track_product_state(qc)
+    if tracked is None:
+        random_bits = None
+    else:
+        states, measured = tracked
+        random_bits = sum(1 for q in measured.values() if states[q] in '+-')
+    if (random_bits is None or random_bits > max_random_bits) and stabilizer_sim.is_clifford(qc):
+        return stabilizer_sim.sample_counts(qc, shots, seed)
+
+    dist = output_distribution(qc, max_random_bits)
+    keys = list(dist)
+    p = np.fromiter(dist.values(), dtype=float, count=len(keys))
+    hits = np.random.default_rng(seed).multinomial(shots, p / p.sum())
+    return {k: int(h) for k, h in zip(keys, hits) if h}
@@ -0,0 +1,144 @@
+"""
+Plot routing shared by the algorithm scripts.
+
+Every figure goes through render(), which either shows it interactively (the
+default, as the scripts always did), renders it on the Agg backend in a
+background process pool and writes PNG/SVG artifacts asynchronously, or skips
+rendering entirely. Batch jobs select a mode with the --plots CLI flag.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+import re
+
+import matplotlib
+
+MODES = ('show', 'save', 'off')
+
+_config = {'mode': 'show', 'out_dir': '.', 'formats': ('png',), 'dpi': 150, 'workers': None}
+_pool = None
+_pending = []
+
+
+def configure(mode='show', out_dir='.', formats=('png',), dpi=150, workers=None):
+    """
+    Select how render() handles figures.
+    :param mode: 'show' (interactive windows), 'save' (Agg artifacts written by a
+        background process pool) or 'off' (no rendering at all).
+    :param formats: File extensions written in 'save' mode, e.g. ('png', 'svg').
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown plot mode '{mode}', choose from {MODES}")
+    if mode != 'show':
+        matplotlib.use('Agg')
+    _config.update(mode=mode, out_dir=out_dir, formats=tuple(formats), dpi=dpi, workers=workers)
+
+
+def mode():
+    """Current plot mode ('show', 'save' or 'off')"""
+    return _config['mode']
+
+
+def add_arguments(parser):
+    """Add the shared --plots/--out-dir/--formats options to an argparse parser"""
+    parser.add_argument('--plots', choices=MODES, default='show',
+                        help="show figures, save them in the background, or skip them (default: show)")
+    parser.add_argument('--out-dir', default='.', help="directory for saved figures (default: .)")
+    parser.add_argument('--formats', default='png', help="comma-separated formats for saved figures (default: png)")
+
+
+def configure_from_args(args):
+    """Apply the options added by add_arguments"""
+    configure(args.plots, args.out_dir, args.formats.split(','))
+
+
+def circuit_figure(qc):
+    """Matplotlib drawing of a QuantumCircuit (picklable helper for render)"""
+    return qc.draw(output='mpl')
+
+
+def _stem(filename, name):
+    if filename:
+        return filename
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', name or '').strip('_').lower()
+    return slug or f"figure_{len(_pending)}"
+
+
+def _save(fig, stem, out_dir, formats, dpi):
+    base, ext = os.path.splitext(stem)
+    if ext:
+        formats = (ext[1:],)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for fmt in formats:
+        path = os.path.join(out_dir, f"{base}.{fmt}")
+        fig.savefig(path, dpi=dpi)
+        paths.append(path)
+    return paths
+
+
+def save(fig, filename):
+    """Write an already built figure to the output directory right away (no-op in 'off' mode)"""
+    if _config['mode'] == 'off':
+        return []
+    return _save(fig, filename, _config['out_dir'], _config['formats'], _config['dpi'])
+
+
+def _render_job(plot_fn, args, kwargs, title, stem, out_dir, formats, dpi):
+    """Worker side of 'save' mode: build the figure on Agg, write it and free it"""
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig = plot_fn(*args, **kwargs)
+    if title:
+        fig.suptitle(title)
+    paths = _save(fig, stem, out_dir, formats, dpi)
+    plt.close(fig)
+    return paths
+
+
+def render(plot_fn, *args, title=None, filename=None, name=None, block=True, **kwargs):
+    """
+    Build a figure with plot_fn(*args, **kwargs) and route it according to the plot mode.
+    plot_fn must return a Figure; in 'save' mode it and its arguments are pickled
+    to a worker process, so use module-level functions.
+    :param filename: Artifact name (extension optional); shown figures are saved too when given.
+    :param name: Artifact name used only in 'save' mode; defaults to a slug of the title.
+    :param block: Block on plt.show() in 'show' mode.
+    :return: The Figure ('show'), a Future resolving to the written paths ('save'), or None ('off').
+    """
+    global _pool
+    current = _config['mode']
+    if current == 'off':
+        return None
+
+    stem = _stem(filename, name or title)
+    if current == 'save':
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=_config['workers'])
+        future = _pool.submit(_render_job, plot_fn, args, kwargs, title, stem,
+                              _config['out_dir'], _config['formats'], _config['dpi'])
+        _pending.append(future)
+        return future
+
+    import matplotlib.pyplot as plt
+
+    fig = plot_fn(*args, **kwargs)
+    if title:
+        fig.suptitle(title)
+    if filename:
+        _save(fig, stem, _config['out_dir'], _config['formats'], _config['dpi'])
+    plt.show(block=block)
+    if not block:
+        plt.pause(0.1)
+    return fig
+
+
+def wait():
+    """Block until every queued artifact is written; returns the written paths"""
+    global _pool
+    paths = [path for future in _pending for path in future.result()]
+    _pending.clear()
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+    return paths
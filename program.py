@@ -1,12 +1,9 @@
-import sys
+import argparse
 import cudaq
 
-print(f"Running on target {cudaq.get_target().name}")
-qubit_count = int(sys.argv[1]) if 1 < len(sys.argv) else 2
-
 
 @cudaq.kernel
-def kernel():
+def kernel(qubit_count: int):
     qubits = cudaq.qvector(qubit_count)
     h(qubits[0])
     for i in range(1, qubit_count):
@@ -14,5 +11,15 @@ def kernel():
     mz(qubits)
 
 
-result = cudaq.sample(kernel)
-print(result)  # Example: { 11:500 00:500 }
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description="GHZ sampling on the current CUDA-Q target")
+    parser.add_argument('qubit_count', type=int, nargs='?', default=2)
+    args = parser.parse_args()
+
+    print(f"Running on target {cudaq.get_target().name}")
+    result = cudaq.sample(kernel, args.qubit_count)
+    print(result)  # Example: { 11:500 00:500 }
+
+
+if __name__ == "__main__":
+    main()
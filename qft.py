@@ -0,0 +1,57 @@
+"""
+Shared Quantum Fourier Transform helpers for the phase-estimation scripts.
+
+Synthesized QFT/QFT† gates are memoized so every circuit reuses the same gate
+object, and apply_qft offers a simulator fast path that transforms a register
+of the amplitude vector with one numpy.fft call instead of an O(n²) gate sweep.
+"""
+from functools import lru_cache
+
+from qiskit.circuit.library import QFT
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def qft_gate(num_qubits, inverse=False, do_swaps=True, approximation_degree=0):
+    """
+    Memoized QFT (or QFT†) gate, keyed by (n, inverse, swaps, approximation degree).
+    :param approximation_degree: Number of smallest controlled-phase rotations dropped
+        per qubit (approximate QFT); 0 is the exact transform.
+    """
+    label = "QFT†" if inverse else "QFT"
+    if approximation_degree:
+        label += f" (approx {approximation_degree})"
+    qft = QFT(num_qubits=num_qubits, inverse=inverse, do_swaps=do_swaps,
+              approximation_degree=approximation_degree)
+    return qft.to_gate(label=label)
+
+
+def _bit_reverse(m):
+    """Index permutation reversing the order of m bits"""
+    idx = np.arange(2**m)
+    rev = np.zeros_like(idx)
+    for b in range(m):
+        rev |= ((idx >> b) & 1) << (m - 1 - b)
+    return rev
+
+
+def apply_qft(psi, qubits, inverse=False, do_swaps=True):
+    """
+    Exact QFT (or QFT†) on a register of consecutive qubits via numpy.fft along one axis.
+    Matches qiskit's QFT: |x⟩ → 2^(-m/2) Σ_k e^{±2πi·xk/2^m} |k⟩, with qubits[0] the least significant bit.
+    """
+    n = psi.size.bit_length() - 1
+    start, m = qubits[0], len(qubits)
+    if list(qubits) != list(range(start, start + m)):
+        raise ValueError("QFT register must be a run of consecutive qubits")
+
+    v = psi.reshape(2**(n - start - m), 2**m, 2**start)
+    # Without the final swaps the forward QFT leaves its output bit-reversed
+    # (and the inverse expects bit-reversed input)
+    if inverse and not do_swaps:
+        v[...] = v[:, _bit_reverse(m), :]
+    transform = np.fft.fft if inverse else np.fft.ifft
+    v[...] = transform(v, axis=1, norm="ortho")
+    if not inverse and not do_swaps:
+        v[...] = v[:, _bit_reverse(m), :]
+    return psi
@@ -1,39 +1,71 @@
 from qiskit import QuantumCircuit
-from typing import Dict
-from random import randint, shuffle
+from typing import Dict, Optional
+import argparse
+import numpy as np
+
+from statevector_sim import H, apply_1q, basis_index, index_bits
 
 
 def xor_str(a: str, b: str) -> str:
     return ''.join(str(int(x) ^ int(y)) for x, y in zip(a, b))
 
 
-def create_2to1_map(mask: str) -> Dict[str, str]:
+def create_2to1_table(mask: str, seed=None) -> np.ndarray:
+    """
+    Integer lookup table of a random 2-to-1 function with f(x) = f(x⊕s), in O(2^n).
+    Entry x (indexed like the amplitude vector) holds f(x); pairs {x, x⊕s} get
+    distinct outputs, and s = 0 yields a random one-to-one function.
+    """
+    n = len(mask)
+    N = 2**n
+    s = basis_index(mask)
+    rng = np.random.default_rng(seed)
+    table = np.empty(N, dtype=np.min_scalar_type(N - 1))
+    if s == 0:
+        table[:] = rng.permutation(N)
+        return table
+
+    x = np.arange(N)
+    reps = x[(x & (s & -s)) == 0]  # one representative of every pair {x, x⊕s}
+    outputs = rng.permutation(N)[:reps.size]
+    table[reps] = outputs
+    table[reps ^ s] = outputs
+    return table
+
+
+def create_2to1_map(mask: str, seed=None) -> Dict[str, str]:
     """Generate a valid 2-to-1 function f(x) = f(x⊕s)"""
     n = len(mask)
-    all_inputs = [format(i, f'0{n}b') for i in range(2**n)]
-    shuffle(all_inputs)
-
-    fmap = {}
-    while all_inputs:
-        x = all_inputs.pop()
-        x_pair = xor_str(x, mask)
-        if x_pair in all_inputs:
-            all_inputs.remove(x_pair)
-        y = format(randint(0, 2**n - 1), f'0{n}b')
-        fmap[x] = y
-        fmap[x_pair] = y
-    return fmap
-
-
-def build_simon_circuit(mask: str, fmap: Dict[str, str]) -> QuantumCircuit:
+    table = create_2to1_table(mask, seed)
+    labels = [index_bits(i, n) for i in range(2**n)]
+    return {labels[x]: labels[fx] for x, fx in enumerate(table.tolist())}
+
+
+def linear_simon_oracle(qc: QuantumCircuit, mask: str) -> None:
+    """
+    Compact XOR-mask oracle for f(x) = x ⊕ (x_j · s), j = first set bit of s.
+    f(x) = f(x⊕s) holds by construction and only n + |s| CX gates are emitted.
+    """
     n = len(mask)
-    qc = QuantumCircuit(2 * n, n)
 
-    # Step 1: Apply Hadamard to input qubits
+    # Copy the input register into the output register
     for i in range(n):
-        qc.h(i)
+        qc.cx(i, n + i)
+
+    # XOR the mask into the output whenever the pivot bit x_j is set
+    if '1' in mask:
+        j = mask.index('1')
+        for i, bit in enumerate(mask):
+            if bit == '1':
+                qc.cx(j, n + i)
 
-def build_simon_circuit(mask: str, fmap: Dict[str, str]) -> QuantumCircuit:
+
+def build_simon_circuit(mask: str, fmap: Optional[Dict[str, str]] = None) -> QuantumCircuit:
+    """
+    Simon's algorithm circuit.
+    :param fmap: Explicit 2-to-1 lookup table, compiled into O(n·2^n) mcx gates.
+        When omitted, the compact linear_simon_oracle is used instead.
+    """
     n = len(mask)
     qc = QuantumCircuit(2 * n, n)
 
@@ -42,24 +74,28 @@ def build_simon_circuit(mask: str, fmap: Dict[str, str]) -> QuantumCircuit:
         qc.h(i)
 
     # Step 2: Oracle (U_f)
-    for x, fx in fmap.items():
-        x_bits = [int(b) for b in x]
-        fx_bits = [int(b) for b in fx]
+    if fmap is None:
+        linear_simon_oracle(qc, mask)
+    else:
+        for x, fx in fmap.items():
+            x_bits = [int(b) for b in x]
+            fx_bits = [int(b) for b in fx]
 
-        # Apply X gates to prepare input state |x⟩
-        for i, bit in enumerate(x_bits):
-            if bit == 0:
-                qc.x(i)
+            # Apply X gates to prepare input state |x⟩
+            for i, bit in enumerate(x_bits):
+                if bit == 0:
+                    qc.x(i)
 
-        # Apply multi-controlled X gates to encode f(x) into output qubits
-        for i, bit in enumerate(fx_bits):
-            if bit == 1:
-                qc.mcx(list(range(n)), n + i)  # Control on input, target output
+            # Apply multi-controlled X gates to encode f(x) into output qubits
+            for i, bit in enumerate(fx_bits):
+                if bit == 1:
+                    qc.mcx(list(range(n)), n + i)  # Control on input, target output
 
-        # Uncompute X gates
-        for i, bit in enumerate(x_bits):
-            if bit == 0:
-                qc.x(i)
+            # Uncompute X gates
+            for i, bit in enumerate(x_bits):
+                if bit == 0:
+                    qc.x(i)
+    qc.barrier()
 
     # Step 3: Apply Hadamard again to input qubits
     for i in range(n):
@@ -70,28 +106,162 @@ def build_simon_circuit(mask: str, fmap: Dict[str, str]) -> QuantumCircuit:
         qc.measure(i, i)
 
     return qc
-    # Step 2: Placeholder for oracle
-    qc.barrier()  # Indicates where oracle would be implemented
 
-    # Step 3: Apply Hadamard again to input qubits
-    for i in range(n):
-        qc.h(i)
 
-    # Step 4: Measure input qubits
+def fmap_table(fmap: Dict[str, str]) -> np.ndarray:
+    """Integer lookup table f[x] of a bitstring map, indexed like the amplitude vector"""
+    n = len(next(iter(fmap)))
+    table = np.empty(2**n, dtype=np.int64)
+    for x, fx in fmap.items():
+        table[basis_index(x)] = basis_index(fx)
+    return table
+
+
+def apply_simon_oracle(psi: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """
+    Apply U_f |x⟩|y⟩ = |x⟩|y⊕f(x)⟩ as one gather on the (output, input) view of
+    the 2n-qubit amplitude vector, instead of a cascade of mcx gates.
+    """
+    N = table.size
+    v = psi.reshape(N, N)
+    rows = np.arange(N)[:, None] ^ table[None, :]
+    v[...] = v[rows, np.arange(N)[None, :]]
+    return psi
+
+
+def linear_2to1_table(mask: str) -> np.ndarray:
+    """Lookup table of the function implemented by linear_simon_oracle"""
+    x = np.arange(2**len(mask))
+    s = basis_index(mask)
+    return np.where(x & (s & -s), x ^ s, x)
+
+
+def simon_statevector(mask: str, fmap=None) -> np.ndarray:
+    """
+    Pre-measurement state of Simon's circuit, simulated directly on the amplitude vector.
+    :param fmap: Bitstring map or integer table from create_2to1_table; defaults to
+        the function of linear_simon_oracle.
+    """
+    if fmap is None:
+        table = linear_2to1_table(mask)
+    elif isinstance(fmap, np.ndarray):
+        table = fmap
+    else:
+        table = fmap_table(fmap)
+    n = len(mask)
+    N = 2**n
+
+    psi = np.zeros(N * N, dtype=complex)
+    psi[:N] = 1 / np.sqrt(N)  # H on every input qubit of |0⟩|0⟩
+    apply_simon_oracle(psi, table)
     for i in range(n):
-        qc.measure(i, i)
+        apply_1q(psi, H, i)
+    return psi
 
-    return qc
+
+def _oracle_table(oracle) -> np.ndarray:
+    """Lookup table of a mask string (linear oracle), bitstring map or create_2to1_table array"""
+    if isinstance(oracle, str):
+        return linear_2to1_table(oracle)
+    return oracle if isinstance(oracle, np.ndarray) else fmap_table(oracle)
+
+
+def simon_samples(oracle, seed=None):
+    """
+    Endless stream of measured input registers z (as basis indices) for Simon's circuit.
+    The output register is never touched after the oracle, so it is measured first
+    (deferred measurement): y = f(x0) for a uniform x0 leaves the input register in the
+    uniform superposition of the preimage f⁻¹(y), which the final H layer turns into z.
+    Only 2^n amplitudes are kept instead of the 4^n of simon_statevector.
+    :param oracle: Secret mask string for the linear oracle, or a lookup table
+        (bitstring map or create_2to1_table array) for an arbitrary 2-to-1 function.
+    """
+    rng = np.random.default_rng(seed)
+    table = _oracle_table(oracle)
+    N = table.size
+    n = N.bit_length() - 1
+    while True:
+        y = table[rng.integers(N)]
+        psi = (table == y).astype(complex)
+        for i in range(n):
+            apply_1q(psi, H, i)
+        p = psi.real ** 2 + psi.imag ** 2
+        yield int(rng.choice(N, p=p / p.sum()))
+
+
+def _reduce(basis: Dict[int, int], z: int) -> int:
+    """Reduce z against the row-echelon basis {pivot bit: row}; returns 0 if z is dependent"""
+    while z:
+        top = z.bit_length() - 1
+        if top not in basis:
+            return z
+        z ^= basis[top]
+    return 0
+
+
+def _null_vector(basis: Dict[int, int], n: int) -> int:
+    """Non-zero solution of z·s = 0 for a basis of rank n−1 (Gauss–Jordan on packed rows)"""
+    pivots = sorted(basis)
+    for p in pivots:
+        for q in pivots:
+            if q != p and basis[q] >> p & 1:
+                basis[q] ^= basis[p]
+    free = next(c for c in range(n) if c not in basis)
+    s = 1 << free
+    for p, row in basis.items():
+        if row >> free & 1:
+            s |= 1 << p
+    return s
+
+
+def solve_simon(oracle, seed=None, max_shots=None):
+    """
+    End-to-end Simon solver.
+    Streams measurement samples into an incremental GF(2) row-echelon basis of
+    packed integer bitsets and stops as soon as n−1 independent equations are
+    known; the candidate mask is checked against the oracle (f(0) = f(s)) and
+    sampling continues to full rank only when the answer is s = 0.
+    :param oracle: Secret mask string (linear oracle) or 2-to-1 lookup table.
+    :return: Recovered mask (character i is qubit i) and the number of shots used.
+    """
+    n = len(oracle) if isinstance(oracle, str) else len(oracle).bit_length() - 1
+    if n < 1:
+        raise ValueError("Simon's problem needs at least one input bit")
+    table = _oracle_table(oracle)
+    if n == 1:
+        return ('1' if table[0] == table[1] else '0'), 0
+    if max_shots is None:
+        max_shots = 64 * (n + 1)
+
+    basis, shots = {}, 0
+    for z in simon_samples(oracle, seed):
+        shots += 1
+        z = _reduce(basis, z)
+        if z:
+            basis[z.bit_length() - 1] = z
+            if len(basis) == n:
+                return '0' * n, shots
+            if len(basis) == n - 1:
+                candidate = _null_vector(dict(basis), n)
+                if table[0] == table[candidate]:
+                    return index_bits(candidate, n), shots
+        if shots >= max_shots:
+            raise RuntimeError(f"No mask recovered after {shots} shots")
 
 
 def main():
-    mask = input("Enter secret bitmask (e.g., 101): ").strip()
+    parser = argparse.ArgumentParser(description="Simon's algorithm")
+    parser.add_argument('mask', nargs='?', help="secret bitmask, e.g. 101 (prompted for when omitted)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    mask = args.mask if args.mask is not None else input("Enter secret bitmask (e.g., 101): ").strip()
     if not all(c in "01" for c in mask):
         print("❌ Invalid input. Enter a binary string like '101'")
         return
 
     # Generate 2-to-1 mapping based on mask
-    fmap = create_2to1_map(mask)
+    fmap = create_2to1_map(mask, seed=args.seed)
     print("\nGenerated 2-to-1 mapping (f(x) = f(x⊕s)):")
     for k in sorted(fmap):
         print(f"{k} -> {fmap[k]}")
@@ -101,7 +271,10 @@ def main():
     print("\n🧠 Simon's Algorithm Quantum Circuit:")
     print(circuit.draw())  # ASCII circuit in terminal
 
+    # Sample until n−1 independent equations are known and solve for the mask
+    recovered, shots = solve_simon(fmap, seed=args.seed)
+    print(f"\n🔑 Recovered mask: {recovered} (after {shots} shots)")
+
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,106 @@
+"""
+Shot sampling from Born-rule probability vectors.
+
+Counts are kept as a pair of integer arrays (basis indices, hit counts) and only
+turned into Qiskit-style bitstring dictionaries on request, so million-shot runs
+on 20+ qubits never build millions of Python strings.
+
+- sample_indices(): one multinomial call, best for a single draw from a state.
+- alias_table() / make_sampler(): Walker alias table built once in O(2^n), after
+  which every draw from the same state costs O(shots).
+"""
+import numpy as np
+
+
+def normalized(p: np.ndarray) -> np.ndarray:
+    """Probability vector as float64 summing to one (amplitudes are squared first if complex)"""
+    p = np.abs(p) ** 2 if np.iscomplexobj(p) else np.asarray(p, dtype=np.float64)
+    return p / p.sum()
+
+
+def sample_indices(p: np.ndarray, shots: int, seed=None):
+    """
+    Draw all shots with a single multinomial call.
+    :param p: Probabilities of every basis state (normalized here).
+    :return: (indices, counts): observed basis indices in increasing order and their hit counts.
+    """
+    hits = np.random.default_rng(seed).multinomial(shots, normalized(p))
+    indices = np.flatnonzero(hits)
+    return indices, hits[indices]
+
+
+def alias_table(p: np.ndarray):
+    """
+    Walker/Vose alias table for the distribution p, built with vectorized searches.
+    Column k keeps outcome k with probability prob[k] and otherwise yields alias[k].
+    Small columns (p·N < 1) are topped up by the large columns in order; a large column
+    whose surplus runs out becomes small itself and is topped up by the next large one,
+    so the whole schedule follows from cumulative sums of deficits and surpluses.
+    :return: (prob, alias) arrays of length len(p).
+    """
+    N = p.size
+    q = normalized(p) * N
+    prob = np.ones(N)
+    alias = np.arange(N, dtype=np.min_scalar_type(N))
+
+    small = np.flatnonzero(q < 1)
+    large = np.flatnonzero(q >= 1)
+    if small.size == 0 or large.size == 0:
+        return prob, alias
+
+    # Cumulative deficit before each small column and cumulative surplus of the large columns
+    deficit = np.concatenate(([0.0], np.cumsum(1 - q[small])))
+    surplus = np.cumsum(q[large] - 1)
+
+    # A small column is topped up by the first large column whose surplus is not yet used up
+    donor = np.minimum(np.searchsorted(surplus, deficit[:-1], side='right'), large.size - 1)
+    prob[small] = q[small]
+    alias[small] = large[donor]
+
+    # Overshoot o_j = (deficit charged to larges ≤ j) − (their surplus): if positive,
+    # large j ended below one and is topped up by large j + 1
+    charged = deficit[np.searchsorted(deficit[:-1], surplus, side='left')]
+    overshoot = charged - surplus
+    exhausted = np.flatnonzero(overshoot[:-1] > 0)
+    prob[large[exhausted]] = 1 - overshoot[exhausted]
+    alias[large[exhausted]] = large[exhausted + 1]
+    return prob, alias
+
+
+def draw_from_table(table, shots: int, seed=None) -> np.ndarray:
+    """Per-shot basis indices drawn from an alias table in O(shots)"""
+    prob, alias = table
+    u = np.random.default_rng(seed).random(shots) * prob.size
+    column = u.astype(np.int64)
+    u -= column
+    return np.where(u < prob[column], column, alias[column])
+
+
+def tally(shot_indices: np.ndarray, num_states: int):
+    """Aggregate per-shot indices into (indices, counts), via bincount when that is cheaper than sorting"""
+    if num_states <= shot_indices.size:
+        hits = np.bincount(shot_indices, minlength=num_states)
+        indices = np.flatnonzero(hits)
+        return indices, hits[indices]
+    return np.unique(shot_indices, return_counts=True)
+
+
+def make_sampler(p: np.ndarray):
+    """
+    Build the alias table for p once and return draw(shots, seed=None, memory=False).
+    draw returns (indices, counts), or the per-shot index array when memory=True;
+    each call is O(shots) however many times the same state is sampled.
+    """
+    table = alias_table(p)
+    num_states = p.size
+
+    def draw(shots, seed=None, memory=False):
+        shot_indices = draw_from_table(table, shots, seed)
+        return shot_indices if memory else tally(shot_indices, num_states)
+
+    return draw
+
+
+def to_bitstrings(indices: np.ndarray, counts: np.ndarray, n: int) -> dict:
+    """Qiskit-style counts dictionary (qubit n-1 leftmost) from (indices, counts) arrays"""
+    return {format(int(i), f'0{n}b'): int(c) for i, c in zip(indices, counts)}
@@ -0,0 +1,206 @@
+"""
+Multi-process sharded statevector simulation on CPU cores.
+
+The 2^n amplitudes live in one multiprocessing.shared_memory block split into
+P = 2^p equal shards, one per worker process. Basis index bits 0..n-p-1 are
+local to a shard and bits n-p..n-1 (the global qubits) select the shard:
+
+- gates on local qubits run independently inside every shard,
+- a gate whose target is a global qubit pairs shard s with s ^ (1 << k) and
+  updates both halves of the pair straight from shared memory, each worker of
+  the pair taking half of the elements, so the exchange needs no copies,
+- controls on global qubits simply switch a shard's work on or off.
+
+Consecutive local gates are batched into one stage, so workers only
+synchronise around global-qubit gates. This is the CPU counterpart of the
+mqpu targets in Cuda_Q/MULTIGPU2.PY and Cuda_Q/multi_gpu_visual.py.
+"""
+from multiprocessing import Pool, shared_memory
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate
+from qiskit.quantum_info import Operator
+import numpy as np
+
+from sampling import sample_indices, to_bitstrings
+from statevector_sim import apply_1q, apply_controlled, mix_pair
+
+_shard = {}
+
+
+def _flatten(qc):
+    """Circuit as (mat, target, controls, ctrl_state) steps; final measurements and barriers are skipped"""
+    steps = []
+    for instruction in qc.data:
+        op = instruction.operation
+        qubits = [qc.find_bit(q).index for q in instruction.qubits]
+        if op.name in ('barrier', 'id', 'delay', 'measure'):
+            continue
+        if op.num_qubits == 1:
+            steps.append((Operator(op).data, qubits[0], (), 0))
+        elif isinstance(op, ControlledGate) and op.base_gate.num_qubits == 1:
+            k = op.num_ctrl_qubits
+            mat = Operator(op.base_gate).data
+            if op.name == 'cu':
+                mat = mat * np.exp(1j * float(op.params[3]))  # γ is a relative phase once controlled
+            steps.append((mat, qubits[k], tuple(qubits[:k]), op.ctrl_state))
+        elif op.definition is not None:
+            inner = QuantumCircuit(qc.num_qubits)
+            inner.append(op, qubits)
+            steps.extend(_flatten(inner.decompose()))
+        else:
+            raise ValueError(f"Unsupported operation '{op.name}' for the sharded backend")
+    return steps
+
+
+def _stages(steps, local_qubits):
+    """Group steps into ('local', [steps]) batches and single ('global', step) stages"""
+    stages = []
+    for step in steps:
+        if step[1] >= local_qubits:
+            stages.append(('global', step))
+        elif stages and stages[-1][0] == 'local':
+            stages[-1][1].append(step)
+        else:
+            stages.append(('local', [step]))
+    return stages
+
+
+def _attach(name, n, shard_qubits):
+    """Worker initializer: map the shared amplitude block once per process"""
+    block = shared_memory.SharedMemory(name=name)
+    _shard['block'] = block
+    _shard['psi'] = np.ndarray(1 << n, dtype=np.complex128, buffer=block.buf)
+    _shard['local'] = n - shard_qubits
+
+
+def _split_controls(controls, ctrl_state, local, shard):
+    """Local part of the controls, or None when a global control rules this shard out"""
+    local_controls, local_state = [], 0
+    for k, c in enumerate(controls):
+        want = (ctrl_state >> k) & 1
+        if c >= local:
+            if (shard >> (c - local)) & 1 != want:
+                return None
+        else:
+            local_state |= want << len(local_controls)
+            local_controls.append(c)
+    return local_controls, local_state
+
+
+def _run_local(shard, steps):
+    local = _shard['local']
+    size = 1 << local
+    view = _shard['psi'][shard * size:(shard + 1) * size]
+    for mat, target, controls, ctrl_state in steps:
+        split = _split_controls(controls, ctrl_state, local, shard)
+        if split is None:
+            continue
+        local_controls, local_state = split
+        if local_controls:
+            apply_controlled(view, mat, target, local_controls, local_state)
+        else:
+            apply_1q(view, mat, target)
+
+
+def _run_global(shard, step):
+    mat, target, controls, ctrl_state = step
+    local = _shard['local']
+    size = 1 << local
+    split = _split_controls(controls, ctrl_state, local, shard)
+    if split is None:
+        return
+    local_controls, local_state = split
+
+    # The pair (low, high) differs in the target's shard bit; each partner updates half of the elements
+    bit = 1 << (target - local)
+    low, high = shard & ~bit, shard | bit
+    start = 0 if shard == low else size // 2
+    stop = start + size // 2 if local else size
+    if not local and shard != low:
+        return
+    psi = _shard['psi']
+    a = psi[low * size + start:low * size + stop]
+    b = psi[high * size + start:high * size + stop]
+    if local_controls:
+        offsets = np.arange(start, stop)
+        keep = np.ones(offsets.size, dtype=bool)
+        for k, c in enumerate(local_controls):
+            keep &= ((offsets >> c) & 1) == ((local_state >> k) & 1)
+        a0, b0 = a[keep], b[keep]
+        a[keep] = mat[0, 0] * a0 + mat[0, 1] * b0
+        b[keep] = mat[1, 0] * a0 + mat[1, 1] * b0
+    else:
+        mix_pair(a, b, mat)
+
+
+def _run_stage(args):
+    kind, shard, payload = args
+    if kind == 'local':
+        _run_local(shard, payload)
+    else:
+        _run_global(shard, payload)
+
+
+def _shard_sample(args):
+    shard, shots, seed = args
+    size = 1 << _shard['local']
+    indices, counts = sample_indices(np.abs(_shard['psi'][shard * size:(shard + 1) * size]) ** 2, shots, seed)
+    return indices + shard * size, counts
+
+
+def _shard_weight(shard):
+    size = 1 << _shard['local']
+    chunk = _shard['psi'][shard * size:(shard + 1) * size]
+    return float(np.vdot(chunk, chunk).real)
+
+
+def run(qc, processes=4, shots=None, seed=None):
+    """
+    Simulate qc from |0...0⟩ on `processes` worker processes (a power of two ≤ 2^n).
+    :param shots: When given, sample that many shots inside the workers and return
+        (indices, counts) arrays over all qubits; otherwise return a copy of the final amplitudes.
+    """
+    n = qc.num_qubits
+    shard_qubits = int(processes).bit_length() - 1
+    if processes < 1 or 1 << shard_qubits != processes or shard_qubits > n:
+        raise ValueError("processes must be a power of two no larger than 2^n")
+    stages = _stages(_flatten(qc), n - shard_qubits)
+
+    block = shared_memory.SharedMemory(create=True, size=16 << n)
+    try:
+        psi = np.ndarray(1 << n, dtype=np.complex128, buffer=block.buf)
+        psi.fill(0)
+        psi[0] = 1
+        with Pool(processes, initializer=_attach, initargs=(block.name, n, shard_qubits)) as pool:
+            for kind, payload in stages:
+                pool.map(_run_stage, [(kind, shard, payload) for shard in range(processes)])
+            if shots is None:
+                result = psi.copy()
+            else:
+                # Split the shots over the shards by their total weight, then sample each shard locally
+                weights = np.array(pool.map(_shard_weight, range(processes)))
+                per_shard = np.random.default_rng(seed).multinomial(shots, weights / weights.sum())
+                seeds = np.random.SeedSequence(seed).spawn(processes)
+                parts = pool.map(_shard_sample, [(s, int(k), seeds[s]) for s, k in enumerate(per_shard) if k])
+                result = (np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]))
+        del psi
+    finally:
+        block.close()
+        block.unlink()
+    return result
+
+
+def ghz_circuit(qubit_count):
+    """GHZ preparation H(0), CX(0, i) as in the Cuda_Q kernels"""
+    qc = QuantumCircuit(qubit_count)
+    qc.h(0)
+    for i in range(1, qubit_count):
+        qc.cx(0, i)
+    return qc
+
+
+def sample_ghz_state(qubit_count: int, processes: int = 4, shots: int = 1000, seed=None) -> dict:
+    """CPU counterpart of Cuda_Q/MULTIGPU2.PY's sample_ghz_state: Qiskit-style GHZ counts from a sharded run"""
+    indices, counts = run(ghz_circuit(qubit_count), processes, shots=shots, seed=seed)
+    return to_bitstrings(indices, counts, qubit_count)
@@ -0,0 +1,244 @@
+"""
+Sparse statevector backend for oracle-structured circuits.
+
+DJ, BV, Simon and GHZ circuits keep only a handful of nonzero amplitudes in the
+computational basis for most of their run. The state here is stored as the
+sorted basis indices of its support plus their amplitudes, so memory follows the
+support size instead of 2^n:
+
+- X/Y/CX/MCX/SWAP permute indices, Z/S/T/P/RZ/CZ only rescale amplitudes,
+- H and other branching gates at most double the support and merge duplicates,
+- once the support passes dense_fraction · 2^n the state switches to a dense
+  vector, and the rest of the circuit is cancelled and fused by circuit_opt and
+  run on the statevector_sim routines.
+
+Indices are int64, so circuits may use up to 63 qubits. Measurements are treated
+as final (as in oracle_analysis); a gate after a measurement on the same qubit is rejected.
+"""
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate
+from qiskit.quantum_info import Operator
+import numpy as np
+
+import circuit_opt
+from sampling import sample_indices, to_bitstrings
+from statevector_sim import apply_1q
+
+_ATOL = 1e-12
+
+_MATRICES = {
+    'id': np.eye(2),
+    'x': np.array([[0, 1], [1, 0]]),
+    'y': np.array([[0, -1j], [1j, 0]]),
+    'z': np.diag([1, -1]),
+    'h': np.array([[1, 1], [1, -1]]) / np.sqrt(2),
+    's': np.diag([1, 1j]),
+    'sdg': np.diag([1, -1j]),
+    't': np.diag([1, np.exp(1j * np.pi / 4)]),
+    'tdg': np.diag([1, np.exp(-1j * np.pi / 4)]),
+}
+
+
+def zero_state(n: int) -> dict:
+    """Sparse |0...0⟩ on n qubits: {'n', 'indices', 'amps', 'dense'}"""
+    if n > 63:
+        raise ValueError("Sparse states index basis states with int64 and support at most 63 qubits")
+    return {'n': n, 'indices': np.zeros(1, dtype=np.int64), 'amps': np.ones(1, dtype=np.complex128), 'dense': False}
+
+
+def support_size(state: dict) -> int:
+    """Number of stored amplitudes (2^n once the state is dense)"""
+    return state['amps'].size
+
+
+def to_dense(state: dict) -> np.ndarray:
+    """Full 2^n amplitude vector of the state"""
+    if state['dense']:
+        return state['amps']
+    psi = np.zeros(1 << state['n'], dtype=np.complex128)
+    psi[state['indices']] = state['amps']
+    return psi
+
+
+def _densify(state, dense_fraction, max_dense_qubits, max_support):
+    n = state['n']
+    size = state['amps'].size
+    if state['dense']:
+        return
+    if n > max_dense_qubits:
+        if size > max_support:
+            raise MemoryError(f"Support of {size} amplitudes on {n} qubits is too large for the sparse backend")
+    elif size > dense_fraction * (1 << n):
+        state['amps'] = to_dense(state)
+        state['indices'] = None
+        state['dense'] = True
+
+
+def _control_mask(indices, controls, ctrl_state):
+    """Boolean mask of basis states whose control qubits match ctrl_state (bit k ↔ controls[k])"""
+    cond = np.ones(indices.size, dtype=bool)
+    for k, c in enumerate(controls):
+        bit = (indices >> c) & 1
+        cond &= bit == ((ctrl_state >> k) & 1)
+    return cond
+
+
+def apply_controlled_1q(state: dict, mat, target: int, controls=(), ctrl_state=None,
+                        dense_fraction=1 / 16, max_dense_qubits=28, max_support=1 << 22) -> dict:
+    """
+    Apply a (multi-)controlled 2x2 matrix to the target qubit in place.
+    Diagonal matrices rescale amplitudes, anti-diagonal ones flip the target bit,
+    and anything else branches each basis state into two (merging duplicates).
+    :param ctrl_state: Required control values as an integer, bit k for controls[k] (default: all ones).
+    """
+    mat = np.asarray(mat, dtype=np.complex128)
+    if ctrl_state is None:
+        ctrl_state = (1 << len(controls)) - 1
+    bit = np.int64(1) << target
+
+    if state['dense']:
+        psi = state['amps']
+        if not controls:
+            apply_1q(psi, mat, target)
+            return state
+        indices = np.arange(psi.size, dtype=np.int64)
+        sel = indices[_control_mask(indices, controls, ctrl_state) & ((indices & bit) == 0)]
+        a, b = psi[sel], psi[sel | bit]
+        psi[sel] = mat[0, 0] * a + mat[0, 1] * b
+        psi[sel | bit] = mat[1, 0] * a + mat[1, 1] * b
+        return state
+
+    indices, amps = state['indices'], state['amps']
+    cond = _control_mask(indices, controls, ctrl_state) if controls else np.ones(indices.size, dtype=bool)
+    ones = (indices & bit) != 0
+
+    if mat[0, 1] == 0 and mat[1, 0] == 0:
+        amps[cond & ~ones] *= mat[0, 0]
+        amps[cond & ones] *= mat[1, 1]
+        return state
+
+    if mat[0, 0] == 0 and mat[1, 1] == 0:
+        amps[cond & ~ones] *= mat[1, 0]
+        amps[cond & ones] *= mat[0, 1]
+        indices[cond] ^= bit
+        order = np.argsort(indices, kind='stable')
+        state['indices'], state['amps'] = indices[order], amps[order]
+        return state
+
+    # Branching gate: every selected basis state feeds both target values
+    i, a, b = indices[cond], amps[cond], ones[cond]
+    low = i & ~bit
+    new_indices = np.concatenate((indices[~cond], low, low | bit))
+    new_amps = np.concatenate((amps[~cond], np.where(b, mat[0, 1], mat[0, 0]) * a,
+                               np.where(b, mat[1, 1], mat[1, 0]) * a))
+    merged, inverse = np.unique(new_indices, return_inverse=True)
+    summed = (np.bincount(inverse, weights=new_amps.real, minlength=merged.size)
+              + 1j * np.bincount(inverse, weights=new_amps.imag, minlength=merged.size))
+    keep = np.abs(summed) > _ATOL
+    state['indices'], state['amps'] = merged[keep], summed[keep]
+    _densify(state, dense_fraction, max_dense_qubits, max_support)
+    return state
+
+
+def apply_swap(state: dict, a: int, b: int) -> dict:
+    """Exchange two qubits by swapping their index bits"""
+    if state['dense']:
+        n = state['n']
+        t = state['amps'].reshape((2,) * n)
+        state['amps'] = np.ascontiguousarray(np.swapaxes(t, n - 1 - a, n - 1 - b)).reshape(-1)
+        return state
+    indices = state['indices']
+    differ = ((indices >> a) ^ (indices >> b)) & 1
+    indices ^= differ * ((np.int64(1) << a) | (np.int64(1) << b))
+    order = np.argsort(indices, kind='stable')
+    state['indices'], state['amps'] = indices[order], state['amps'][order]
+    return state
+
+
+def _apply_operation(state, op, qubits, **kwargs):
+    name = op.name
+    if name in ('barrier', 'id', 'delay'):
+        return
+    if name == 'swap':
+        apply_swap(state, *qubits)
+    elif name in _MATRICES:
+        apply_controlled_1q(state, _MATRICES[name], qubits[0], **kwargs)
+    elif isinstance(op, ControlledGate) and op.base_gate.num_qubits == 1:
+        # cx, cz, ccx, mcx, cp, crz, ch, ...: controls come first, the target last
+        k = op.num_ctrl_qubits
+        mat = Operator(op.base_gate).data
+        if name == 'cu':
+            mat = mat * np.exp(1j * float(op.params[3]))  # γ is a relative phase once controlled
+        apply_controlled_1q(state, mat, qubits[k], controls=qubits[:k],
+                            ctrl_state=op.ctrl_state, **kwargs)
+    elif op.num_qubits == 1 and not op.is_parameterized():
+        apply_controlled_1q(state, Operator(op).data, qubits[0], **kwargs)
+    elif op.definition is not None:
+        definition = op.definition
+        for inner in definition.data:
+            inner_qubits = [qubits[definition.find_bit(q).index] for q in inner.qubits]
+            _apply_operation(state, inner.operation, inner_qubits, **kwargs)
+    else:
+        raise ValueError(f"Unsupported operation '{name}' for the sparse backend")
+
+
+def simulate(qc, dense_fraction=1 / 16, max_dense_qubits=28, max_support=1 << 22):
+    """
+    Run qc from |0...0⟩ on the sparse backend.
+    :param dense_fraction: Switch to a dense vector once the support exceeds this fraction of 2^n.
+    :param max_dense_qubits: Never densify above this many qubits; larger states stay sparse.
+    :param max_support: Raise MemoryError when a state that cannot densify outgrows this many amplitudes.
+    :return: (state, measured) with measured a {clbit: qubit} map of the final measurements.
+    """
+    state = zero_state(qc.num_qubits)
+    measured = {}
+    done = set()
+    # Gates left once the state is dense: optimized as a whole by circuit_opt
+    rest = QuantumCircuit(qc.num_qubits)
+    for instruction in qc.data:
+        op = instruction.operation
+        qubits = [qc.find_bit(q).index for q in instruction.qubits]
+        if done.intersection(qubits) and op.name != 'barrier':
+            raise ValueError("The sparse backend only supports final measurements")
+        if op.name == 'measure':
+            measured[qc.find_bit(instruction.clbits[0]).index] = qubits[0]
+            done.add(qubits[0])
+        elif state['dense']:
+            rest.append(op, qubits)
+        else:
+            _apply_operation(state, op, qubits, dense_fraction=dense_fraction,
+                             max_dense_qubits=max_dense_qubits, max_support=max_support)
+    if rest.data:
+        state['amps'] = circuit_opt.apply_blocks(state['amps'], circuit_opt.optimize(rest))
+    return state, measured
+
+
+def probabilities(state: dict):
+    """(indices, probabilities) of the basis states in the support"""
+    amps = state['amps']
+    indices = np.arange(amps.size, dtype=np.int64) if state['dense'] else state['indices']
+    return indices, amps.real ** 2 + amps.imag ** 2
+
+
+def sample(state: dict, shots: int, seed=None):
+    """Draw shots over the support with one multinomial call; returns (indices, counts) arrays"""
+    support, p = probabilities(state)
+    hit, counts = sample_indices(p, shots, seed)
+    return support[hit], counts
+
+
+def sample_counts(qc, shots=1024, seed=None, **kwargs):
+    """
+    Simulate qc on the sparse backend and return Qiskit-style counts over its classical bits.
+    Circuits without measurements are sampled over all qubits.
+    """
+    state, measured = simulate(qc, **kwargs)
+    indices, counts = sample(state, shots, seed)
+    if not measured:
+        return to_bitstrings(indices, counts, qc.num_qubits)
+
+    keys = np.zeros(indices.size, dtype=np.int64)
+    for c, q in measured.items():
+        keys |= ((indices >> q) & 1) << c
+    merged, inverse = np.unique(keys, return_inverse=True)
+    return to_bitstrings(merged, np.bincount(inverse, weights=counts).astype(np.int64), qc.num_clbits)
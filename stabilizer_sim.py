@@ -0,0 +1,292 @@
+"""
+Stabilizer (Clifford) simulator in the CHP style of Aaronson and Gottesman.
+
+GHZ, Bernstein–Vazirani and Deutsch–Jozsa circuits only use H, X, CX and
+measurement, so their state is described by n stabilizer generators instead of
+2^n amplitudes. The tableau keeps destabilizer rows 0..n-1 and stabilizer rows
+n..2n-1 as packed uint64 bit matrices x and z of shape (2n, ceil(n/64)) plus a
+sign bit per row:
+
+- every gate updates one or two bit columns across all rows, O(n) per gate,
+- a measurement multiplies at most 2n rows, O(n²/64) word operations,
+- shots are drawn from the affine subspace x0 ⊕ span(X-parts of the stabilizers)
+  that holds every Z-basis outcome of a stabilizer state, so sampling needs one
+  row reduction of the tableau and then a GF(2) matrix product per batch of shots.
+
+Thousand-qubit GHZ states sample in well under a second on a laptop CPU.
+"""
+import numpy as np
+
+from pauli_sum import popcount
+
+_ONE = np.uint64(1)
+
+CLIFFORD_GATES = {'id', 'barrier', 'measure', 'h', 's', 'sdg', 'x', 'y', 'z', 'sx', 'sxdg',
+                  'cx', 'cy', 'cz', 'swap'}
+
+
+def zero_state(n: int) -> dict:
+    """Tableau of |0...0⟩: destabilizers X_i, stabilizers Z_i, all signs +"""
+    words = (n + 63) // 64
+    x = np.zeros((2 * n, words), dtype=np.uint64)
+    z = np.zeros((2 * n, words), dtype=np.uint64)
+    for q in range(n):
+        x[q, q >> 6] |= _ONE << np.uint64(q & 63)
+        z[n + q, q >> 6] |= _ONE << np.uint64(q & 63)
+    return {'n': n, 'x': x, 'z': z, 'r': np.zeros(2 * n, dtype=np.uint8)}
+
+
+def _column(a, q):
+    """Bit q of every row as a uint8 array"""
+    return ((a[:, q >> 6] >> np.uint64(q & 63)) & _ONE).astype(np.uint8)
+
+
+def _flip(a, q, bits):
+    """XOR a 0/1 array of per-row bits into column q"""
+    a[:, q >> 6] ^= bits.astype(np.uint64) << np.uint64(q & 63)
+
+
+def _multiply(x1, z1, r1, x2, z2, r2):
+    """
+    Row-wise Pauli products P1·P2 on packed rows, with the sign tracked mod 4.
+    Each qubit where the factors anticommute contributes a factor ±i; the -i
+    positions are the anticommuting ones where x ^ z ^ (x1 & z2) of the product is set.
+    :return: (x, z, r) of the products.
+    """
+    x = x1 ^ x2
+    z = z1 ^ z2
+    x1z2 = x1 & z2
+    anti = (x2 & z1) ^ x1z2
+    minus = (x ^ z ^ x1z2) & anti
+    log_i = popcount(anti).sum(axis=-1) + 2 * popcount(minus).sum(axis=-1) + 2 * (r1.astype(np.int64) + r2)
+    return x, z, ((log_i & 3) >> 1).astype(np.uint8)
+
+
+def h(state, q):
+    x, z = state['x'], state['z']
+    xq, zq = _column(x, q), _column(z, q)
+    state['r'] ^= xq & zq
+    _flip(x, q, xq ^ zq)
+    _flip(z, q, xq ^ zq)
+
+
+def s(state, q):
+    xq = _column(state['x'], q)
+    state['r'] ^= xq & _column(state['z'], q)
+    _flip(state['z'], q, xq)
+
+
+def x_gate(state, q):
+    state['r'] ^= _column(state['z'], q)
+
+
+def z_gate(state, q):
+    state['r'] ^= _column(state['x'], q)
+
+
+def y_gate(state, q):
+    state['r'] ^= _column(state['x'], q) ^ _column(state['z'], q)
+
+
+def cx(state, a, b):
+    x, z = state['x'], state['z']
+    xa, za, xb, zb = _column(x, a), _column(z, a), _column(x, b), _column(z, b)
+    state['r'] ^= xa & zb & (xb ^ za ^ 1)
+    _flip(x, b, xa)
+    _flip(z, a, zb)
+
+
+def sdg(state, q):
+    s(state, q)
+    z_gate(state, q)
+
+
+def _sx(state, q, inverse=False):
+    h(state, q)
+    (sdg if inverse else s)(state, q)
+    h(state, q)
+
+
+def cz(state, a, b):
+    h(state, b)
+    cx(state, a, b)
+    h(state, b)
+
+
+def cy(state, a, b):
+    sdg(state, b)
+    cx(state, a, b)
+    s(state, b)
+
+
+def swap(state, a, b):
+    cx(state, a, b)
+    cx(state, b, a)
+    cx(state, a, b)
+
+
+_GATES = {
+    'h': h, 's': s, 'sdg': sdg, 'x': x_gate, 'y': y_gate, 'z': z_gate,
+    'sx': _sx, 'sxdg': lambda state, q: _sx(state, q, inverse=True),
+    'cx': cx, 'cy': cy, 'cz': cz, 'swap': swap,
+}
+
+
+def measure(state, q, rng) -> int:
+    """Measure qubit q in the Z basis, collapsing the tableau; random outcomes come from rng"""
+    n, x, z, r = state['n'], state['x'], state['z'], state['r']
+    xq = _column(x, q)
+    anticommuting = np.flatnonzero(xq[n:]) + n
+
+    if anticommuting.size:
+        # Random outcome: make row p the only stabilizer not commuting with Z_q, then replace it by ±Z_q
+        p = anticommuting[0]
+        rows = np.flatnonzero(xq)
+        rows = rows[rows != p]
+        x[rows], z[rows], r[rows] = _multiply(x[rows], z[rows], r[rows], x[p], z[p], r[p])
+        x[p - n], z[p - n], r[p - n] = x[p], z[p], r[p]
+        x[p] = 0
+        z[p] = 0
+        z[p, q >> 6] = _ONE << np.uint64(q & 63)
+        r[p] = rng.integers(2)
+        return int(r[p])
+
+    # Deterministic outcome: ±Z_q is the product of the stabilizers paired with destabilizers containing X_q
+    rows = np.flatnonzero(xq[:n]) + n
+    px, pz, pr = x[rows], z[rows], r[rows]
+    while px.shape[0] > 1:
+        half = px.shape[0] // 2
+        prod = _multiply(px[:half], pz[:half], pr[:half], px[half:2 * half], pz[half:2 * half], pr[half:2 * half])
+        if px.shape[0] % 2:
+            prod = tuple(np.concatenate((p, a[-1:])) for p, a in zip(prod, (px, pz, pr)))
+        px, pz, pr = prod
+    return int(pr[0])
+
+
+def is_clifford(qc) -> bool:
+    """True when every instruction of qc is a supported Clifford gate, barrier or final measurement"""
+    done = set()
+    for instruction in qc.data:
+        name = instruction.operation.name
+        qubits = {qc.find_bit(q).index for q in instruction.qubits}
+        if name not in CLIFFORD_GATES or (name != 'barrier' and done & qubits):
+            return False
+        if name == 'measure':
+            done |= qubits
+    return True
+
+
+def simulate(qc):
+    """
+    Run a Clifford circuit from |0...0⟩ on the tableau.
+    :return: (state, measured) with measured a {clbit: qubit} map of the final measurements.
+    """
+    if not is_clifford(qc):
+        raise ValueError("The stabilizer backend only runs Clifford circuits with final measurements")
+    state = zero_state(qc.num_qubits)
+    measured = {}
+    for instruction in qc.data:
+        name = instruction.operation.name
+        qubits = [qc.find_bit(q).index for q in instruction.qubits]
+        if name == 'measure':
+            measured[qc.find_bit(instruction.clbits[0]).index] = qubits[0]
+        elif name in _GATES:
+            _GATES[name](state, *qubits)
+    return state, measured
+
+
+def _echelon(x, z, r, columns, track_phase=True):
+    """
+    In-place GF(2) row reduction of packed Pauli rows on their x bits over the given columns.
+    Rows are combined with _multiply so the signs stay correct (or by plain XOR when the rows
+    are Z-only and track_phase is False); rows above each pivot are cleared too.
+    :return: (rank, pivot columns)
+    """
+    rank = 0
+    pivots = []
+    for q in columns:
+        if rank == x.shape[0]:
+            break
+        hits = np.flatnonzero(_column(x, q))
+        below = hits[hits >= rank]
+        if below.size == 0:
+            continue
+        pivot = below[0]
+        for a in (x, z, r):
+            a[[rank, pivot]] = a[[pivot, rank]]
+        others = hits[hits != pivot]
+        others = np.where(others == rank, pivot, others)
+        if others.size:
+            if track_phase:
+                x[others], z[others], r[others] = _multiply(x[others], z[others], r[others], x[rank], z[rank], r[rank])
+            else:
+                x[others] ^= x[rank]
+                r[others] ^= r[rank]
+        pivots.append(q)
+        rank += 1
+    return rank, pivots
+
+
+def support(state):
+    """
+    Affine support of the state in the Z basis: every measurement outcome is x0 ⊕ (a
+    combination of the basis rows), each with equal probability.
+    Row reduction on the X-parts of the stabilizers leaves k rows spanning the support
+    and n-k Z-only stabilizers ±Z^v, which fix the parities v·x0 = sign bit.
+    :return: (x0 as an (n,) uint8 array, basis as packed (k, words) uint64 rows)
+    """
+    n = state['n']
+    x, z, r = state['x'][n:].copy(), state['z'][n:].copy(), state['r'][n:].copy()
+    k, _ = _echelon(x, z, r, range(n))
+
+    # Solve the Z-only parities: reduce them on their z bits (plain XOR, Z strings commute)
+    zx, zr = z[k:].copy(), r[k:].copy()
+    _, pivots = _echelon(zx, np.empty_like(zx), zr, range(n), track_phase=False)
+    x0 = np.zeros(n, dtype=np.uint8)
+    x0[pivots] = zr[:len(pivots)]
+    return x0, x[:k]
+
+
+def _unpack(rows, n):
+    """(rows, words) uint64 → (rows, n) uint8 bits, column q = qubit q"""
+    as_bytes = np.ascontiguousarray(rows).view(np.uint8)
+    return np.unpackbits(as_bytes, axis=-1, bitorder='little')[:, :n]
+
+
+def sample_outcomes(state, shots, seed=None, chunk_bits=1 << 24) -> np.ndarray:
+    """
+    Z-basis outcomes of every qubit for each shot, as a (shots, n) uint8 array.
+    Each shot adds a uniformly random combination of the support basis to x0 (see support()),
+    computed as one float32 matrix product per chunk of shots.
+    """
+    n = state['n']
+    rng = np.random.default_rng(seed)
+    x0, basis = support(state)
+    basis = _unpack(basis, n).astype(np.float32)
+
+    out = np.empty((shots, n), dtype=np.uint8)
+    rows_per_chunk = max(1, chunk_bits // max(1, n))
+    for start in range(0, shots, rows_per_chunk):
+        stop = min(shots, start + rows_per_chunk)
+        coins = rng.integers(0, 2, size=(stop - start, basis.shape[0])).astype(np.float32)
+        out[start:stop] = (coins @ basis).astype(np.int64) & 1
+        out[start:stop] ^= x0
+    return out
+
+
+def sample_counts(qc, shots=1024, seed=None) -> dict:
+    """
+    Run a Clifford circuit on the tableau and return Qiskit-style counts over its classical bits
+    (over all qubits when the circuit has no measurements).
+    """
+    state, measured = simulate(qc)
+    outcomes = sample_outcomes(state, shots, seed)
+    if measured:
+        clbits = np.zeros((shots, qc.num_clbits), dtype=np.uint8)
+        for c, q in measured.items():
+            clbits[:, c] = outcomes[:, q]
+    else:
+        clbits = outcomes
+
+    rows, counts = np.unique(clbits[:, ::-1], axis=0, return_counts=True)
+    return {''.join('1' if b else '0' for b in row): int(c) for row, c in zip(rows, counts)}
@@ -0,0 +1,232 @@
+"""
+Native NumPy statevector routines used as a fast path by the algorithm scripts.
+
+Amplitudes follow Qiskit's little-endian ordering: bit i of a basis index is
+the state of qubit i, so results can be wrapped in ``Statevector(psi)`` and
+plotted with the usual Qiskit helpers.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from sampling import sample_indices, to_bitstrings
+
+
+def basis_index(bits: str) -> int:
+    """Basis index of a bitstring whose character i is the value of qubit i"""
+    return int(bits[::-1], 2)
+
+
+def index_bits(index: int, n: int) -> str:
+    """Inverse of basis_index: bitstring whose character i is the value of qubit i"""
+    return format(index, f'0{n}b')[::-1]
+
+
+def zero_state(n: int, dtype=np.complex128) -> np.ndarray:
+    """|0...0⟩ on n qubits"""
+    psi = np.zeros(1 << n, dtype=dtype)
+    psi[0] = 1
+    return psi
+
+
+def uniform_state(n: int, dtype=np.float64) -> np.ndarray:
+    """Equal superposition H^⊗n |0...0⟩ on n qubits"""
+    psi = np.empty(1 << n, dtype=dtype)
+    psi.fill(1 / np.sqrt(1 << n))
+    return psi
+
+
+def phase_flip(psi: np.ndarray, marked) -> np.ndarray:
+    """
+    Diagonal oracle: flip the sign of the marked basis states in place.
+    :param marked: Basis index or array of basis indices to mark.
+    """
+    psi[marked] *= -1
+    return psi
+
+
+def reflect_about_mean(psi: np.ndarray) -> np.ndarray:
+    """
+    Diffuser: ψ → 2⟨ψ⟩ − ψ in place, i.e. (2|s⟩⟨s| − I) with |s⟩ uniform.
+    The X/H/MCX diffuser in grover.py implements the same reflection up to a global phase of −1.
+    """
+    mean = psi.mean()
+    np.negative(psi, out=psi)
+    psi += 2 * mean
+    return psi
+
+
+def probabilities(psi: np.ndarray) -> np.ndarray:
+    """Born-rule probabilities |ψ|² of every basis state"""
+    return psi.real ** 2 + psi.imag ** 2 if np.iscomplexobj(psi) else psi ** 2
+
+
+def sample_counts(psi: np.ndarray, shots: int, seed=None) -> dict:
+    """
+    Draw all shots with a single multinomial call (see sampling.py for index-array counts).
+    Keys are Qiskit-style bitstrings (qubit n-1 leftmost), like Statevector.sample_counts.
+    """
+    n = int(psi.size).bit_length() - 1
+    return to_bitstrings(*sample_indices(probabilities(psi), shots, seed), n)
+
+
+def bloch_vectors(psi: np.ndarray, block: int = 14) -> np.ndarray:
+    """
+    Single-qubit Bloch vectors of every qubit, without building any partial trace.
+    For qubit q the amplitudes pair up as a (bit q = 0) and b (bit q = 1), and
+    ⟨X⟩ + i⟨Y⟩ = 2·Σ a*·b. Qubits below `block` are accumulated chunk by chunk while
+    each 2^block-amplitude chunk is cache resident; higher qubits use contiguous row dots.
+    ⟨Z⟩ comes from halving the probability vector once per qubit (about two passes in total).
+    :return: Array of shape (n, 3) whose row q is (⟨X⟩, ⟨Y⟩, ⟨Z⟩) of qubit q.
+    """
+    n = psi.size.bit_length() - 1
+    b = min(block, n)
+    coherence = np.zeros(n, dtype=np.complex128)
+    for chunk in psi.reshape(-1, 1 << b):
+        for q in range(b):
+            v = chunk.reshape(-1, 2, 1 << q)
+            coherence[q] += np.vdot(v[:, 0, :], v[:, 1, :])
+    for q in range(b, n):
+        v = psi.reshape(-1, 2, 1 << q)
+        coherence[q] = sum(np.vdot(row[0], row[1]) for row in v)
+
+    out = np.empty((n, 3))
+    out[:, 0] = 2 * coherence.real
+    out[:, 1] = 2 * coherence.imag
+    p = probabilities(psi)
+    for q in range(n - 1, -1, -1):
+        halves = p.reshape(2, -1)
+        out[q, 2] = halves[0].sum() - halves[1].sum()
+        p = halves[0] + halves[1]
+    return out
+
+
+def reduced_density_matrix(psi: np.ndarray, qubits) -> np.ndarray:
+    """
+    Reduced density matrix of a few qubits, tracing out the rest with one matrix product.
+    Ordering matches qiskit's partial_trace: qubits[0] is the least significant bit of the row index.
+    """
+    n = psi.size.bit_length() - 1
+    k = len(qubits)
+    t = psi.reshape((2,) * n)
+    m = np.moveaxis(t, [n - 1 - q for q in reversed(qubits)], range(k)).reshape(1 << k, -1)
+    return m @ m.conj().T
+
+
+def pair_density_matrices(psi: np.ndarray, pairs) -> np.ndarray:
+    """
+    Two-qubit reduced density matrices for the selected qubit pairs.
+    :param pairs: Iterable of (i, j) qubit pairs.
+    :return: Array of shape (len(pairs), 4, 4).
+    """
+    pairs = list(pairs)
+    out = np.empty((len(pairs), 4, 4), dtype=np.result_type(psi.dtype, np.complex64))
+    for k, pair in enumerate(pairs):
+        out[k] = reduced_density_matrix(psi, pair)
+    return out
+
+
+H = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
+
+
+def mix_pair(a: np.ndarray, b: np.ndarray, mat: np.ndarray) -> None:
+    """
+    In-place (a, b) ← mat · (a, b) on two equally shaped amplitude views.
+    Diagonal and anti-diagonal matrices (Z/S/T/P, X/Y) skip the arithmetic they do not need.
+    """
+    if mat[0, 1] == 0 and mat[1, 0] == 0:
+        if mat[0, 0] != 1:
+            a *= mat[0, 0]
+        if mat[1, 1] != 1:
+            b *= mat[1, 1]
+        return
+    tmp = a.copy()
+    if mat[0, 0] == 0 and mat[1, 1] == 0:
+        np.multiply(b, mat[0, 1], out=a)
+        np.multiply(tmp, mat[1, 0], out=b)
+        return
+    a *= mat[0, 0]
+    a += mat[0, 1] * b
+    b *= mat[1, 1]
+    b += mat[1, 0] * tmp
+
+
+def apply_1q(psi: np.ndarray, mat: np.ndarray, qubit: int) -> np.ndarray:
+    """Apply a 2x2 matrix to one qubit in place via a (rest, 2, 2^qubit) view of the amplitudes"""
+    v = psi.reshape(-1, 2, 1 << qubit)
+    mix_pair(v[:, 0, :], v[:, 1, :], mat)
+    return psi
+
+
+def apply_unitary(psi: np.ndarray, mat: np.ndarray, qubits) -> np.ndarray:
+    """
+    Apply a 2^k x 2^k matrix to k qubits (qubits[0] is the least significant bit of its index)
+    with one tensordot over the (2,)*n view of the amplitudes.
+    :return: The new amplitude vector (the input is not modified).
+    """
+    n = psi.size.bit_length() - 1
+    k = len(qubits)
+    t = psi.reshape((2,) * n)
+    m = mat.reshape((2,) * (2 * k))
+    axes = [n - 1 - q for q in reversed(qubits)]
+    out = np.tensordot(m, t, axes=(list(range(k, 2 * k)), axes))
+    return np.moveaxis(out, range(k), axes).reshape(-1)
+
+
+def apply_controlled(psi: np.ndarray, mat: np.ndarray, target: int, controls, ctrl_state=None) -> np.ndarray:
+    """
+    Apply a 2x2 matrix to the target qubit, in place, on the slice where every control matches.
+    Touches only 2^(n-len(controls)) amplitudes, so wide mcx gates never become dense matrices.
+    :param ctrl_state: Required control values as an integer, bit k for controls[k] (default: all ones).
+    """
+    n = psi.size.bit_length() - 1
+    if ctrl_state is None:
+        ctrl_state = (1 << len(controls)) - 1
+    index = [slice(None)] * n
+    for k, c in enumerate(controls):
+        index[n - 1 - c] = (ctrl_state >> k) & 1
+    view = psi.reshape((2,) * n)[tuple(index)]
+    axis = (n - 1 - target) - sum(1 for c in controls if c > target)
+    v = np.moveaxis(view, axis, 0)
+    mix_pair(v[:1], v[1:], mat)
+    return psi
+
+
+def apply_permutation(psi: np.ndarray, perm: np.ndarray, qubits, controls=()) -> np.ndarray:
+    """
+    Permutation gate U|x⟩ = |perm[x]⟩ on a register of consecutive qubits, applied
+    as a single fancy-index gather instead of a dense 2^m x 2^m unitary.
+    :param qubits: Register qubits, lowest first (qubits[0] holds the least significant bit of x).
+    :param controls: Qubits outside the register that must all be |1⟩ for U to act.
+    """
+    n = psi.size.bit_length() - 1
+    start, m = qubits[0], len(qubits)
+    if list(qubits) != list(range(start, start + m)):
+        raise ValueError("Permutation register must be a run of consecutive qubits")
+
+    inverse = np.empty_like(perm)
+    inverse[perm] = np.arange(perm.size)
+
+    # Axes: qubits n-1 .. start+m, the register as one axis, qubits start-1 .. 0
+    high = n - start - m
+    t = psi.reshape((2,) * high + (1 << m,) + (2,) * start)
+    index = [slice(None)] * t.ndim
+    for c in controls:
+        index[n - 1 - c if c >= start + m else high + start - c] = 1
+    view = t[tuple(index)]
+    axis = high - sum(1 for c in controls if c >= start + m)
+    view[...] = np.take(view, inverse, axis=axis)
+    return psi
+
+
+@lru_cache(maxsize=None)
+def modmul_permutation(a: int, N: int, m: int, power: int = 1) -> np.ndarray:
+    """
+    Basis permutation of U^power, U|x⟩ = |a·x mod N⟩ on m qubits (states x ≥ N are left alone).
+    Tables are cached per (a, N, m, power) and returned read-only.
+    """
+    x = np.arange(2**m)
+    perm = x.copy()
+    perm[:N] = (pow(a, power, N) * x[:N]) % N
+    perm.flags.writeable = False
+    return perm
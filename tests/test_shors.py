@@ -0,0 +1,31 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Shors
+
+CASES = [(2, 21, 6), (5, 33, 10), (2, 35, 12)]
+SEEDS = range(20)
+
+
+def _uniform_qpe(a, N):
+    """Stand-in for qpe_statevector whose counting register carries no phase information"""
+    n_count, m = Shors.register_sizes(N)
+    return np.full(2**(n_count + m), 2**(-(n_count + m) / 2), dtype=complex)
+
+
+@pytest.mark.parametrize("a, N, r", CASES)
+def test_find_period_recovers_order_from_qpe(a, N, r):
+    hits = sum(Shors.find_period(a, N, seed=seed) == r for seed in SEEDS)
+    assert hits == len(SEEDS)
+
+
+@pytest.mark.parametrize("a, N, r", CASES)
+def test_find_period_fails_on_noise(monkeypatch, a, N, r):
+    monkeypatch.setattr(Shors, "qpe_statevector", _uniform_qpe)
+    hits = sum(Shors.find_period(a, N, seed=seed) == r for seed in SEEDS)
+    assert hits <= len(SEEDS) // 2